@@ -0,0 +1,97 @@
+from .board import Board
+from .move import Move
+from .piece import PieceSide
+from .evaluation import EvalWeights, get_eval_tables
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class BatchEvaluator:
+    """
+    Scores many positions of one board size in one vectorized call, with the same piece-square
+    tables as Board.heuristic() and exactly the same results. Needs numpy.
+    Positions are packed as (player bits, computer bits, king bits), each as little endian bytes.
+    """
+    def __init__(self, total_rows:int, total_cols:int, weights: EvalWeights):
+        if np is None:
+            raise Exception("Batch evaluation needs numpy")
+        tables = get_eval_tables(total_rows, total_cols, weights)
+        self.square_count = len(tables.player_man)
+        self.byte_count = (self.square_count + 7) // 8
+        self.player_man = np.array(tables.player_man, dtype=np.int64)
+        self.player_king = np.array(tables.player_king, dtype=np.int64)
+        self.computer_man = np.array(tables.computer_man, dtype=np.int64)
+        self.computer_king = np.array(tables.computer_king, dtype=np.int64)
+
+    def pack(self, boards: list[Board])->"np.ndarray":
+        """
+        returns the positions as a (positions, 3, bytes) uint8 array
+        """
+        byte_count = self.byte_count
+        data = b"".join(bits.to_bytes(byte_count, "little")
+                        for board in boards for bits in (board.player_bits, board.computer_bits, board.king_bits))
+        return np.frombuffer(data, dtype=np.uint8).reshape(len(boards), 3, byte_count)
+
+    def evaluate(self, boards: list[Board])->"np.ndarray":
+        return self.evaluate_packed(self.pack(boards))
+
+    def evaluate_packed(self, packed: "np.ndarray")->"np.ndarray":
+        """
+        packed: (positions, 3, bytes) uint8 array as returned by pack()
+        returns the heuristic of every position as int64
+        """
+        bits = np.unpackbits(packed, axis=2, bitorder="little")[:, :, :self.square_count].astype(np.int64)
+        player, computer, kings = bits[:, 0], bits[:, 1], bits[:, 2]
+        player_kings = player & kings
+        computer_kings = computer & kings
+        return (player - player_kings) @ self.player_man + player_kings @ self.player_king + \
+            (computer - computer_kings) @ self.computer_man + computer_kings @ self.computer_king
+
+    def evaluate_moves(self, board: Board, moves: list[Move], side: PieceSide)->list[int]:
+        """
+        returns the heuristic of the board after each of the side's moves, without playing them
+        """
+        if side == PieceSide.PLAYER:
+            own_man, own_king, opp_man, opp_king = self.player_man, self.player_king, self.computer_man, self.computer_king
+        else:
+            own_man, own_king, opp_man, opp_king = self.computer_man, self.computer_king, self.player_man, self.player_king
+
+        byte_count = self.byte_count
+        src = np.fromiter((move.src for move in moves), dtype=np.int64, count=len(moves))
+        dst = np.fromiter((move.path[-1] for move in moves), dtype=np.int64, count=len(moves))
+        king_bits = np.unpackbits(np.frombuffer(board.king_bits.to_bytes(byte_count, "little"), dtype=np.uint8),
+                                  bitorder="little")[:self.square_count].astype(bool)
+        promotion = np.unpackbits(np.frombuffer(board.promotion_mask.to_bytes(byte_count, "little"), dtype=np.uint8),
+                                  bitorder="little")[:self.square_count].astype(bool)
+
+        moved_king = king_bits[src]
+        landing = np.where(moved_king | promotion[dst], own_king[dst], own_man[dst])
+        leaving = np.where(moved_king, own_king[src], own_man[src])
+        delta = landing - leaving
+
+        if any(move.captured for move in moves):
+            captured = b"".join(move.captured.to_bytes(byte_count, "little") for move in moves)
+            captured_bits = np.unpackbits(np.frombuffer(captured, dtype=np.uint8).reshape(len(moves), byte_count),
+                                          axis=1, bitorder="little")[:, :self.square_count].astype(np.int64)
+            delta -= captured_bits @ np.where(king_bits, opp_king, opp_man)
+
+        return (delta + board.eval_score).tolist()
+
+_evaluators_by_key: dict[tuple, BatchEvaluator] = {}
+
+def is_batch_evaluation_available()->bool:
+    return np is not None
+
+def get_batch_evaluator(board: Board)->BatchEvaluator | None:
+    """
+    returns the evaluator of the board's size and weights, or None without numpy
+    """
+    if np is None:
+        return None
+    key = (board.total_rows, board.total_cols, board.eval_weights.key())
+    evaluator = _evaluators_by_key.get(key)
+    if evaluator is None:
+        evaluator = BatchEvaluator(board.total_rows, board.total_cols, board.eval_weights)
+        _evaluators_by_key[key] = evaluator
+    return evaluator
@@ -1,371 +1,559 @@
 import logging
-from copy import deepcopy
 from .piece import Piece, PieceSide
 from .game_state import GameState
+from .zobrist import get_zobrist_keys
+from .board_tables import get_board_tables
+from .evaluation import EvalWeights, get_eval_weights, get_eval_tables
+from .move import Move
 from abc import ABC, abstractmethod
 from collections import deque
+from typing import Iterator, Sequence
 
 logger = logging.getLogger(__name__)
 
 class BoardData:
     @abstractmethod
-    def __getitem__(self, key: int)->list[Piece | None]:
+    def __getitem__(self, key: int)->Sequence[Piece | None]:
         pass
-    
+
     @abstractmethod
     def get_size(self)->int:
         pass
 
-class PieceMove:
-    def __init__(self, row:int, col:int, jump_over: Piece|None = None, before: 'PieceMove | None' = None): # type: ignore
-        self.row = row
-        self.col = col
-        self.jump_over = jump_over
-        self.before = before
-        self.after:list[PieceMove] = []
-        
+class BoardRow(Sequence):
+    """
+    read-only view over one row of a bitboard
+    """
+    def __init__(self, board: "Board", row: int):
+        self._board = board
+        self._row = row
+
+    def __getitem__(self, col: int)->Piece | None: # type: ignore
+        if col < 0 or col >= self._board.total_cols:
+            raise IndexError(col)
+        return self._board.get_piece(self._row, col)
+
+    def __len__(self)->int:
+        return self._board.total_cols
+
 class Board(GameState, BoardData):
-    def __init__(self, total_rows:int, total_cols:int):
-        self.board: list[list[Piece | None]] = []
-        self.pieces_left = {PieceSide.PLAYER: 12, PieceSide.COMPUTER: 12}
+    """
+    Dark squares are numbered row by row, with one unused (ghost) bit after every
+    second row. With half = total_cols // 2 this makes every diagonal a constant shift:
+        down-left: +half, down-right: +half + 1, up-right: -half, up-left: -(half + 1)
+    and a step that would wrap around a side of the board lands on a ghost bit.
+    """
+    def __init__(self, total_rows:int, total_cols:int, eval_weights: EvalWeights | None = None):
+        """
+        eval_weights: weights of heuristic(), by default the ones configured for the size
+        """
+        if total_cols % 2 != 0:
+            raise Exception(f"Board width must be even, got {total_cols}")
+
+        self.player_bits = 0
+        self.computer_bits = 0
+        self.king_bits = 0
+        self.pieces_left = {PieceSide.PLAYER: 0, PieceSide.COMPUTER: 0}
         self.kings = {PieceSide.PLAYER: 0, PieceSide.COMPUTER: 0}
+        self.side_to_move = PieceSide.PLAYER
+        self.zobrist_hash = 0
+        self.eval_score = 0
+        self.eval_weights = eval_weights if eval_weights is not None else get_eval_weights(total_rows)
         self.total_rows = total_rows
         self.total_cols = total_cols
+        self.half = total_cols // 2
         self.create_board()
 
-    def __getitem__(self, key: int)->list[Piece | None]:
-        return self.board[key]
-    
+    def __getitem__(self, key: int)->BoardRow:
+        return BoardRow(self, key)
+
     def get_size(self)->int:
-        return len(self.board)
+        return self.total_rows
+
+    def hash(self)->int:
+        """
+        64-bit zobrist hash of the pieces and the side to move, kept up to date by every board change
+        """
+        return self.zobrist_hash
+
+    def compute_hash(self)->int:
+        """
+        computes the zobrist hash from scratch
+        """
+        value = self.zobrist.computer_to_move if self.side_to_move == PieceSide.COMPUTER else 0
+        for side in (PieceSide.PLAYER, PieceSide.COMPUTER):
+            bits = self._get_side_bits(side)
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                value ^= self._get_piece_keys(side, bool(self.king_bits & bit))[bit.bit_length() - 1]
+        return value
 
     def heuristic(self):
-        return self.pieces_left[PieceSide.COMPUTER] - self.pieces_left[PieceSide.PLAYER] + \
-            (self.kings[PieceSide.COMPUTER] - self.kings[PieceSide.PLAYER])
+        """
+        computer minus player score of material and piece-square tables, kept up to date by every board change
+        """
+        return self.eval_score
+
+    def compute_eval(self)->int:
+        """
+        computes the heuristic from scratch
+        """
+        value = 0
+        for side in (PieceSide.PLAYER, PieceSide.COMPUTER):
+            bits = self._get_side_bits(side)
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                value += self._get_eval_values(side, bool(self.king_bits & bit))[bit.bit_length() - 1]
+        return value
 
     def get_all_moves(self, side)->list["Board"]:
         moves = []
-        for piece in self.get_pieces_by_side(side):
-            valid_moves = self.get_valid_moves(piece)
-            for move, skip in valid_moves.items():
-                temp_board = deepcopy(self)
-                temp_piece = temp_board.get_piece(piece.row, piece.col)
-                new_board = temp_board.simulate_move(temp_piece, move, skip)
-                moves.append(new_board)
-        
+        for move in self.get_moves(side):
+            moves.append(self.get_state_from_move(move))
+
         return moves
-    
-    def get_all_moves_with_nodes(self, side: PieceSide)->list[tuple[PieceMove, "Board"]]:
-        ret = []
-        # logger.debug(f"Getting all moves for {side}")
-        
-        # using dfs to get all the possible moves
-        # TODO: optimize this
-        for piece in self.get_pieces_by_side(side):
-            # logger.debug(f"Piece: {piece.row}, {piece.col}")
-            move_root = self._get_valid_moves_root(piece)
-            
-            for move in self._get_all_moves_from_root(move_root):
-                
-                
-                new_board = self.get_state_from_move(move)
-                ret.append((move, new_board))
-            
-        return ret
-    
-    def get_state_from_move(self, move: PieceMove)->"Board":
-        """
-        move: last piece move node
-        """
-        if not move:
-            raise Exception("Move is None")
-        
-        skip:list[Piece] = []
-        move_it = move
-        while move_it:
-            if move_it.jump_over:
-                skip.append(move_it.jump_over)
-            
-            if move_it.before:
-                move_it = move_it.before
+
+    def get_moves(self, side: PieceSide)->list[Move]:
+        """
+        returns every move the side can make, without building the resulting boards
+        """
+        return list(self.iter_moves(side))
+
+    def iter_moves(self, side: PieceSide, steps:bool = True, captures:bool = True)->Iterator[Move]:
+        """
+        yields the moves of the side one at a time, piece by piece in the order of get_moves
+        steps, captures: which kinds of moves to generate
+        """
+        movable = self.get_movable_bits(side)
+        while movable:
+            bit = movable & -movable
+            movable ^= bit
+            yield from self._iter_piece_moves(bit, side, steps, captures)
+
+    def is_legal_move(self, move: Move, side: PieceSide)->bool:
+        """
+        checks a move that was not generated on this board, e.g. a stored best move or killer move
+        """
+        own, opp = self._get_own_and_opp(side)
+        src_bit = 1 << move.src
+        if not own & src_bit:
+            return False
+        empty = self.valid_mask & ~(own | opp)
+        king = self.king_bits & src_bit
+        verticals = []
+        if side == PieceSide.PLAYER or king:
+            verticals.append(self.tables.up)
+        if side == PieceSide.COMPUTER or king:
+            verticals.append(self.tables.down)
+
+        if not move.captured:
+            return len(move.path) == 1 and bool((1 << move.path[0]) & empty) and \
+                any(move.path[0] == target for vertical in verticals for target, _ in vertical[move.src])
+
+        for vertical in verticals:
+            start = move.src
+            captured = 0
+            for landing in move.path:
+                target = next((target for target, jump in vertical[start] if jump == landing), -1)
+                if target < 0 or not (1 << target) & opp or not (1 << landing) & empty:
+                    break
+                captured |= 1 << target
+                start = landing
             else:
-                break
-            
-        first_piece = self.get_piece(move_it.row, move_it.col)
-        if not first_piece:
-            raise Exception(f'Piece not found at {move_it.row}, {move_it.col}')
-            
-        temp_board = deepcopy(self)
-        temp_piece = temp_board.get_piece(first_piece.row, first_piece.col)
-        new_board = temp_board.simulate_move(temp_piece, (move.row, move.col), skip)        
-            
+                if captured == move.captured:
+                    return True
+        return False
+
+    def __getstate__(self)->tuple:
+        # only the position is sent along, the zobrist keys and lookup tables are the same for every board of a size
+        return (self.total_rows, self.total_cols, self.eval_weights, self.player_bits, self.computer_bits, self.king_bits,
+                self.side_to_move == PieceSide.COMPUTER, self.zobrist_hash, self.eval_score)
+
+    def __setstate__(self, state:tuple):
+        (self.total_rows, self.total_cols, self.eval_weights, self.player_bits, self.computer_bits, self.king_bits,
+         computer_to_move, self.zobrist_hash, self.eval_score) = state
+        self.half = self.total_cols // 2
+        self.pieces_left = {PieceSide.PLAYER: self.player_bits.bit_count(), PieceSide.COMPUTER: self.computer_bits.bit_count()}
+        self.kings = {PieceSide.PLAYER: (self.player_bits & self.king_bits).bit_count(),
+                      PieceSide.COMPUTER: (self.computer_bits & self.king_bits).bit_count()}
+        self.side_to_move = PieceSide.COMPUTER if computer_to_move else PieceSide.PLAYER
+        self.tables = get_board_tables(self.total_rows, self.total_cols)
+        self.valid_mask = self.tables.valid_mask
+        self.promotion_mask = self.tables.promotion_mask
+        self.zobrist = get_zobrist_keys(self.tables.square_count)
+        self.evaluation = get_eval_tables(self.total_rows, self.total_cols, self.eval_weights)
+
+    def copy(self)->"Board":
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board.pieces_left = dict(self.pieces_left)
+        board.kings = dict(self.kings)
+        return board
+
+    def apply(self, move: Move)->tuple:
+        """
+        plays the move on this board in place and returns an undo token for undo()
+        """
+        token = (self.player_bits, self.computer_bits, self.king_bits,
+                 self.pieces_left[PieceSide.PLAYER], self.pieces_left[PieceSide.COMPUTER],
+                 self.kings[PieceSide.PLAYER], self.kings[PieceSide.COMPUTER],
+                 self.side_to_move, self.zobrist_hash, self.eval_score)
+
+        from_index = move.src
+        to_index = move.path[-1]
+        from_bit = 1 << from_index
+        to_bit = 1 << to_index
+        captured = move.captured
+        if self.player_bits & from_bit:
+            side, opp = PieceSide.PLAYER, PieceSide.COMPUTER
+            self.player_bits ^= from_bit | to_bit
+            self.computer_bits &= ~captured
+        elif self.computer_bits & from_bit:
+            side, opp = PieceSide.COMPUTER, PieceSide.PLAYER
+            self.computer_bits ^= from_bit | to_bit
+            self.player_bits &= ~captured
+        else:
+            raise Exception(f'Piece not found at {self.get_square_coor(from_bit)}')
+
+        if captured:
+            self.pieces_left[opp] -= captured.bit_count()
+            bits = captured
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                is_king = bool(self.king_bits & bit)
+                self.zobrist_hash ^= self._get_piece_keys(opp, is_king)[bit.bit_length() - 1]
+                self.eval_score -= self._get_eval_values(opp, is_king)[bit.bit_length() - 1]
+            captured_kings = self.king_bits & captured
+            if captured_kings:
+                self.kings[opp] -= captured_kings.bit_count()
+                self.king_bits ^= captured_kings
+
+        if self.king_bits & from_bit:
+            self.king_bits ^= from_bit | to_bit
+            keys = self._get_piece_keys(side, True)
+            self.zobrist_hash ^= keys[from_index] ^ keys[to_index]
+            values = self._get_eval_values(side, True)
+            self.eval_score += values[to_index] - values[from_index]
+        elif to_bit & self.promotion_mask:
+            self.king_bits |= to_bit
+            self.kings[side] += 1
+            self.zobrist_hash ^= self._get_piece_keys(side, False)[from_index] ^ self._get_piece_keys(side, True)[to_index]
+            self.eval_score += self._get_eval_values(side, True)[to_index] - self._get_eval_values(side, False)[from_index]
+        else:
+            keys = self._get_piece_keys(side, False)
+            self.zobrist_hash ^= keys[from_index] ^ keys[to_index]
+            values = self._get_eval_values(side, False)
+            self.eval_score += values[to_index] - values[from_index]
+        self._set_side_to_move(opp)
+
+        return token
+
+    def undo(self, token: tuple):
+        """
+        restores the board to the state before the apply() call that returned the token
+        """
+        (self.player_bits, self.computer_bits, self.king_bits,
+         self.pieces_left[PieceSide.PLAYER], self.pieces_left[PieceSide.COMPUTER],
+         self.kings[PieceSide.PLAYER], self.kings[PieceSide.COMPUTER],
+         self.side_to_move, self.zobrist_hash, self.eval_score) = token
+
+    def get_state_from_move(self, move: Move)->"Board":
+        """
+        returns a copy of this board with the move played
+        """
+        new_board = self.copy()
+        new_board.apply(move)
         return new_board
-        
-    def simulate_move(self, piece, move:tuple[int, int], skip:list[Piece]):
-        self.move(piece, move[0], move[1])
-        if skip:
-            self.remove(skip)
-
-        return self
-
-    def get_pieces_by_side(self, side: PieceSide)->list[Piece]:
-        pieces = []
-        for row in self.board:
-            for piece in row:
-                if piece != None and piece.side == side:
-                    pieces.append(piece)
-        return pieces
-
-    def move(self, piece:Piece, row, col):
-        self.board[piece.row][piece.col], self.board[row][col] = self.board[row][col], self.board[piece.row][piece.col]
-        piece.move(row, col)
-
-        if row == self.total_rows - 1 or row == 0:
-            piece.make_king()
-            self.kings[piece.side] += 1
+
+    def get_move_states(self, move: Move)->list["Board"]:
+        """
+        returns the board after every landing square of the move, used to replay a capture chain step by step
+        """
+        states = []
+        captured = 0
+        for i in range(len(move.path)):
+            start = move.path[i - 1] if i > 0 else move.src
+            if abs(move.path[i] - start) > self.half + 1:
+                # a jump captures the square halfway between its start and landing squares
+                captured |= 1 << ((move.path[i] + start) // 2)
+            states.append(self.get_state_from_move(Move(move.src, move.path[:i + 1], captured)))
+        return states
+
+    def get_pieces_by_side(self, side: PieceSide)->list[tuple[int, int]]:
+        """
+        returns (row, col) of every piece of the side, in O(pieces) from the side's bitboard
+        """
+        coors = self.tables.coors
+        return [coors[index] for index in self.get_piece_indexes(side)]
+
+    def get_piece_indexes(self, side: PieceSide)->list[int]:
+        """
+        returns the square index of every piece of the side
+        """
+        indexes = []
+        bits = self._get_side_bits(side)
+        while bits:
+            bit = bits & -bits
+            indexes.append(bit.bit_length() - 1)
+            bits ^= bit
+        return indexes
+
+    def get_piece_count(self, side: PieceSide)->int:
+        """
+        pieces of the side on the board, kept up to date by every board change
+        """
+        return self.pieces_left[side]
+
+    def get_king_count(self, side: PieceSide)->int:
+        return self.kings[side]
+
+    def move(self, from_row:int, from_col:int, row:int, col:int):
+        """
+        moves the piece on (from_row, from_col) to (row, col), the piece becomes a king on the first or last row
+        """
+        from_bit = self.get_square_bit(from_row, from_col)
+        to_bit = self.get_square_bit(row, col)
+        if self.player_bits & from_bit:
+            side = PieceSide.PLAYER
+            self.player_bits ^= from_bit | to_bit
+        elif self.computer_bits & from_bit:
+            side = PieceSide.COMPUTER
+            self.computer_bits ^= from_bit | to_bit
+        else:
+            raise Exception(f'Piece not found at {from_row}, {from_col}')
+        is_king = bool(self.king_bits & from_bit)
+        if is_king:
+            self.king_bits ^= from_bit | to_bit
+        from_index = from_bit.bit_length() - 1
+        to_index = to_bit.bit_length() - 1
+        keys = self._get_piece_keys(side, is_king)
+        self.zobrist_hash ^= keys[from_index] ^ keys[to_index]
+        values = self._get_eval_values(side, is_king)
+        self.eval_score += values[to_index] - values[from_index]
+
+        if (row == self.total_rows - 1 or row == 0) and not is_king:
+            self.king_bits |= to_bit
+            self.kings[side] += 1
+            self.zobrist_hash ^= keys[to_index] ^ self._get_piece_keys(side, True)[to_index]
+            self.eval_score += self._get_eval_values(side, True)[to_index] - values[to_index]
+
+        self._set_side_to_move(PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER)
 
     def get_piece(self, row, col)->Piece | None:
-        return self.board[row][col]
+        bit = self.get_square_bit(row, col)
+        if not bit:
+            return None
+        if self.player_bits & bit:
+            return self._piece_at_bit(bit, PieceSide.PLAYER)
+        if self.computer_bits & bit:
+            return self._piece_at_bit(bit, PieceSide.COMPUTER)
+        return None
 
     def create_board(self):
-        for row in range(self.total_rows):
-            self.board.append([])
-            for col in range(self.total_cols):
-                if col % 2 == ((row +  1) % 2):
-                    if row < self.total_rows // 2 - 1:
-                        self.board[row].append(Piece(row, col, PieceSide.COMPUTER))
-                    elif row > self.total_rows // 2:
-                        self.board[row].append(Piece(row, col, PieceSide.PLAYER))
-                    else:
-                        self.board[row].append(None)
-                else:
-                    self.board[row].append(None)
-        
-    def remove(self, pieces: list[Piece]):
-        for piece in pieces:
-            self.board[piece.row][piece.col] = None
-            if piece != None:
-                if piece.side == PieceSide.PLAYER:
-                    self.pieces_left[PieceSide.PLAYER] -= 1
-                else:
-                    self.pieces_left[PieceSide.COMPUTER] -= 1
-
-                if piece.king:
-                    if piece.side == PieceSide.PLAYER:
-                        self.kings[PieceSide.PLAYER] -= 1
-                    else:
-                        self.kings[PieceSide.COMPUTER] -= 1
-    
+        self.tables = get_board_tables(self.total_rows, self.total_cols)
+        self.valid_mask = self.tables.valid_mask
+        self.promotion_mask = self.tables.promotion_mask
+        self.player_bits = self.tables.player_start
+        self.computer_bits = self.tables.computer_start
+        self.king_bits = 0
+
+        self.pieces_left = {PieceSide.PLAYER: self.player_bits.bit_count(),
+                            PieceSide.COMPUTER: self.computer_bits.bit_count()}
+        self.kings = {PieceSide.PLAYER: 0, PieceSide.COMPUTER: 0}
+        self.side_to_move = PieceSide.PLAYER
+        self.zobrist = get_zobrist_keys(self.tables.square_count)
+        self.zobrist_hash = self.compute_hash()
+        self.evaluation = get_eval_tables(self.total_rows, self.total_cols, self.eval_weights)
+        self.eval_score = self.compute_eval()
+
+    def set_position(self, player_bits:int, computer_bits:int, king_bits:int, side_to_move: PieceSide):
+        """
+        replaces the pieces and the side to move, the counts, hash and evaluation are computed again
+        """
+        self.player_bits = player_bits
+        self.computer_bits = computer_bits
+        self.king_bits = king_bits
+        self.pieces_left = {PieceSide.PLAYER: player_bits.bit_count(), PieceSide.COMPUTER: computer_bits.bit_count()}
+        self.kings = {PieceSide.PLAYER: (player_bits & king_bits).bit_count(),
+                      PieceSide.COMPUTER: (computer_bits & king_bits).bit_count()}
+        self.side_to_move = side_to_move
+        # compute_hash() and compute_eval() in one pass, per group of pieces
+        value = self.zobrist.computer_to_move if side_to_move == PieceSide.COMPUTER else 0
+        score = 0
+        for side, side_bits in ((PieceSide.PLAYER, player_bits), (PieceSide.COMPUTER, computer_bits)):
+            for king, bits in ((False, side_bits & ~king_bits), (True, side_bits & king_bits)):
+                keys = self._get_piece_keys(side, king)
+                values = self._get_eval_values(side, king)
+                while bits:
+                    bit = bits & -bits
+                    bits ^= bit
+                    index = bit.bit_length() - 1
+                    value ^= keys[index]
+                    score += values[index]
+        self.zobrist_hash = value
+        self.eval_score = score
+
+    def remove(self, squares: list[tuple[int, int]]):
+        """
+        removes the pieces on the (row, col) squares
+        """
+        for row, col in squares:
+            bit = self.get_square_bit(row, col)
+            if self.player_bits & bit:
+                side = PieceSide.PLAYER
+                self.player_bits &= ~bit
+            elif self.computer_bits & bit:
+                side = PieceSide.COMPUTER
+                self.computer_bits &= ~bit
+            else:
+                continue
+            is_king = bool(self.king_bits & bit)
+            self.zobrist_hash ^= self._get_piece_keys(side, is_king)[bit.bit_length() - 1]
+            self.eval_score -= self._get_eval_values(side, is_king)[bit.bit_length() - 1]
+            self.pieces_left[side] -= 1
+
+            if self.king_bits & bit:
+                self.king_bits &= ~bit
+                self.kings[side] -= 1
+
     def winner(self):
         if self.pieces_left[PieceSide.PLAYER] <= 0:
             return PieceSide.COMPUTER
         elif self.pieces_left[PieceSide.COMPUTER] <= 0:
             return PieceSide.PLAYER
         else:
-            return None 
-    
-    def get_valid_moves(self, piece: Piece)->dict[tuple[int, int], list[Piece]]:
+            return None
+
+    def get_valid_moves(self, row:int, col:int)->dict[tuple[int, int], Move]:
         """
-        returns a dictionary of all the valid moves that the piece can make, 
-        with the key being the move: tuple(move_to_row, move_to_col) and the value being the list of pieces that have been jumped over
+        returns a dictionary of all the valid moves that the piece on the square can make,
+        with the key being the square the piece lands on: tuple(move_to_row, move_to_col)
         """
-        move_root = self._get_valid_moves_root(piece)
-        moves = move_root.after
-    
+        bit = self.get_square_bit(row, col)
+        if self.player_bits & bit:
+            side = PieceSide.PLAYER
+        elif self.computer_bits & bit:
+            side = PieceSide.COMPUTER
+        else:
+            return {}
+
         ret = {}
-        for move in moves:
-            for key, value in self._flatten_move(move).items():
-                ret[key] = value
-            
-        # logger.debug(f"Valid moves: {ret}")
-                    
+        for move in self._iter_piece_moves(bit, side):
+            ret[self.get_index_coor(move.path[-1])] = move
+
         return ret
-    
-    def _get_valid_moves_root(self, piece: Piece)->PieceMove:
-        row = piece.row
-        col = piece.col
-
-        root = PieceMove(row, col)
-        if piece.side == PieceSide.PLAYER or piece.king:
-            # moves.update(self._traverse_left(row -1, max(row-3, -1), -1, piece.side, left))
-            # moves.update(self._traverse_right(row -1, max(row-3, -1), -1, piece.side, right))
-            left = self._move(row, col, True, True, piece.side)
-            right = self._move(row, col, False, True, piece.side)
-            
-            if left:
-                left.before = root
-                root.after.append(left)
-            if right:
-                right.before = root
-                root.after.append(right)
-        if piece.side == PieceSide.COMPUTER or piece.king:
-            # moves.update(self._traverse_left(row +1, min(row+3, self.total_rows), 1, piece.side, left))
-            # moves.update(self._traverse_right(row +1, min(row+3, self.total_rows), 1, piece.side, right))
-            left = self._move(row, col, True, False, piece.side)
-            right = self._move(row, col, False, False, piece.side)
-            
-            if left:
-                left.before = root
-                root.after.append(left)
-            if right:
-                right.before = root
-                root.after.append(right)
-                
-        return root
+
+    def get_movable_bits(self, side: PieceSide)->int:
+        """
+        returns the bits of all pieces of the side that have at least one step or jump
+        """
+        own, opp = self._get_own_and_opp(side)
+        empty = self.valid_mask & ~(own | opp)
+        half = self.half
+        kings = own & self.king_bits
+
+        movable = 0
+        # pieces moving down: computer men and all kings
+        down = kings | (own if side == PieceSide.COMPUTER else 0)
+        if down:
+            for shift in (half, half + 1):
+                movable |= down & ((empty >> shift) | ((((empty >> shift) & opp) >> shift)))
+        # pieces moving up: player men and all kings
+        up = kings | (own if side == PieceSide.PLAYER else 0)
+        if up:
+            for shift in (half, half + 1):
+                movable |= up & ((empty << shift) | ((((empty << shift) & opp) << shift)))
+
+        return movable
+
+    def get_square_bit(self, row:int, col:int)->int:
+        """
+        returns the bit of a dark square, or 0 for a light square
+        """
+        if (row + col) % 2 == 0:
+            return 0
+        return 1 << (row * self.half + row // 2 + col // 2)
+
+    def get_square_coor(self, bit:int)->tuple[int, int]:
+        return self.get_index_coor(bit.bit_length() - 1)
+
+    def get_index_coor(self, index:int)->tuple[int, int]:
+        """
+        returns (row, col) of a square index, the position of its bit
+        """
+        return self.tables.coors[index]
+
+    def get_move_coors(self, move: Move)->list[tuple[int, int]]:
+        """
+        returns (row, col) of the start square and of every landing square of the move
+        """
+        return [self.get_index_coor(index) for index in (move.src,) + move.path]
+
+    def _get_piece_keys(self, side: PieceSide, king: bool)->list[int]:
+        if side == PieceSide.PLAYER:
+            return self.zobrist.player_king if king else self.zobrist.player_man
+        return self.zobrist.computer_king if king else self.zobrist.computer_man
+
+    def _get_eval_values(self, side: PieceSide, king: bool)->list[int]:
+        if side == PieceSide.PLAYER:
+            return self.evaluation.player_king if king else self.evaluation.player_man
+        return self.evaluation.computer_king if king else self.evaluation.computer_man
+
+    def _set_side_to_move(self, side: PieceSide):
+        if side != self.side_to_move:
+            self.side_to_move = side
+            self.zobrist_hash ^= self.zobrist.computer_to_move
+
+    def _get_side_bits(self, side: PieceSide)->int:
+        return self.player_bits if side == PieceSide.PLAYER else self.computer_bits
+
+    def _get_own_and_opp(self, side: PieceSide)->tuple[int, int]:
+        if side == PieceSide.PLAYER:
+            return self.player_bits, self.computer_bits
+        return self.computer_bits, self.player_bits
+
+    def _piece_at_bit(self, bit:int, side: PieceSide)->Piece:
+        return Piece.get(side, bool(self.king_bits & bit))
 
     def get_all_pieces(self)->list[list[Piece | None]]:
-        return self.board
-    
-    def _flatten_move(self, move: PieceMove)->dict[tuple[int, int], list[Piece]]:
-        moves:dict[tuple[int, int], list[Piece]] = {}
-        frontier = deque([move])
-        
-        while len(frontier) > 0:
-            current = frontier.popleft()
-            before = current.before
-            before_jump_all = [] if (before == None or (before.row, before.col) not in moves) else moves[(before.row, before.col)]
-            moves[(current.row, current.col)] = before_jump_all + [current.jump_over] if current.jump_over else before_jump_all
-            for after in current.after:
-                frontier.append(after)
-        
-        return moves
-    
-    def _get_all_moves_from_root(self, root: PieceMove)->list[PieceMove]:
+        return [list(self[row]) for row in range(self.total_rows)]
+
+    def _iter_piece_moves(self, bit:int, side: PieceSide, steps:bool = True, captures:bool = True)->Iterator[Move]:
         """
-        return all the moves from the root node excluding the root node
+        yields the steps and capture chains of the piece on the bit, breadth first.
+        A capture chain may stop on any landing square and only continues in the vertical direction of its first jump.
         """
-        moves = []
-        frontier = deque([root])
-        
-        while len(frontier) > 0:
-            current = frontier.popleft()
-            if current != root:
-                moves.append(current)
-                
-            for after in current.after:
-                frontier.append(after)
+        own, opp = self._get_own_and_opp(side)
+        empty = self.valid_mask & ~(own | opp)
+        src = bit.bit_length() - 1
 
-        return moves
-    
-    def _move(self, start_row: int, start_col: int, left: bool, up: bool, side: PieceSide, before: PieceMove|None=None)->PieceMove|None:            
-        coors_to_check:list[tuple[int, int]] = []
-        horizontal = -1 if left else 1
-        vertical = -1 if up else 1
-        
-        for i in range(1, 3):
-            cur_row = start_row + i * vertical
-            cur_col = start_col + i * horizontal
-            if cur_row < 0 or cur_row >= self.total_rows or cur_col < 0 or cur_col >= self.total_cols:
-                break
-            
-            coors_to_check.append((cur_row, cur_col))
-            
-        last = None
-        for coor in coors_to_check:
-            cur_row, cur_col = coor
-            current = self.board[cur_row][cur_col]
-            if current == None:
-                if before and not last:
-                    return None
-                
-                if last:
-                    move = PieceMove(cur_row, cur_col, jump_over=last, before=before)
-                    
-                    # if before:
-                    #     log_path = []
-                    #     while before:
-                    #         log_path.append((before.row, before.col))
-                    #         before = before.before
-                            
-                    #     log_path.reverse()
-                    #     log_path.append((cur_row, cur_col))
-                    #     logger.debug(f"Path: {log_path}")
-                    left_move = self._move(cur_row, cur_col, True, up, side, before=move)
-                    right_move = self._move(cur_row, cur_col, False, up, side, before=move)
-                    if left_move:
-                        move.after.append(left_move)
-                    if right_move:
-                        move.after.append(right_move)
-                    return move
-                else:
-                    return PieceMove(cur_row, cur_col, before=before)
-            elif current.side == side:
-                return None
-            else:
-                last = current
-                
-        return None
+        verticals = []
+        king = self.king_bits & bit
+        if side == PieceSide.PLAYER or king:
+            verticals.append(self.tables.up)
+        if side == PieceSide.COMPUTER or king:
+            verticals.append(self.tables.down)
+
+        frontier:deque[tuple[Move, int, list]] = deque()
+        for vertical in verticals:
+            for target, landing in vertical[src]:
+                target_bit = 1 << target
+                if target_bit & empty:
+                    if steps:
+                        yield Move(src, (target,))
+                elif captures and target_bit & opp and landing >= 0 and (1 << landing) & empty:
+                    move = Move(src, (landing,), target_bit)
+                    yield move
+                    frontier.append((move, landing, vertical))
 
-    # def _traverse_left(self, start_row: int, stop_row: int, row_step: int, side:PieceSide, cur_col: int, skipped: list[Piece]=[])->list[PieceMove]:
-    #     """
-    #     skipped:  list of pieces that have been jumped over
-    #     """
-    #     moves = []
-    #     last = []
-    #     for cur_row in range(start_row, stop_row, row_step):
-    #         if cur_col < 0:
-    #             break
-            
-    #         current = self.board[cur_row][cur_col]
-            
-    #         # if the adj cell is empty
-    #         if current == None:
-    #             # if there are pieces that have been jumped over and the last piece has been reached
-    #             if skipped and not last:
-    #                 break
-    #             elif skipped:
-    #                 moves[(cur_row, cur_col)] = last + skipped
-    #             else:
-    #                 moves[(cur_row, cur_col)] = last
-                
-    #             # jump over the piece
-    #             if last:
-    #                 if row_step == -1:
-    #                     next_stop_row = max(cur_row-3, 0)
-    #                 else:
-    #                     next_stop_row = min(cur_row+3, self.total_rows)
-    #                 moves.update(self._traverse_left(cur_row+row_step, next_stop_row, row_step, side, cur_col-1,skipped=last))
-    #                 moves.update(self._traverse_right(cur_row+row_step, next_stop_row, row_step, side, cur_col+1,skipped=last))
-    #             break
-    #         # if the adj cell has a piece of the current player
-    #         elif current.side == side:
-    #             break
-    #         else:
-    #             last = [current]
-
-    #         cur_col -= 1
-        
-    #     return moves
-
-    # def _traverse_right(self, start_row: int, stop_row: int, row_step: int, side:PieceSide, cur_col: int, skipped:list[Piece]=[])->dict[tuple[int, int], list[Piece]]:
-    #     moves = {}
-    #     last = []
-    #     for cur_row in range(start_row, stop_row, row_step):
-    #         if cur_col >= self.total_cols:
-    #             break
-            
-    #         current = self.board[cur_row][cur_col]
-    #         if current == None:
-    #             if skipped and not last:
-    #                 break
-    #             elif skipped:
-    #                 moves[(cur_row, cur_col)] = last + skipped
-    #             else:
-    #                 moves[(cur_row, cur_col)] = last
-                
-    #             if last:
-    #                 if row_step == -1:
-    #                     row = max(cur_row-3, 0)
-    #                 else:
-    #                     row = min(cur_row+3, self.total_rows)
-    #                 moves.update(self._traverse_left(cur_row+row_step, row, row_step, side, cur_col-1,skipped=last))
-    #                 moves.update(self._traverse_right(cur_row+row_step, row, row_step, side, cur_col+1,skipped=last))
-    #             break
-    #         elif current.side == side:
-    #             break
-    #         else:
-    #             last = [current]
-
-    #         cur_col += 1
-        
-    #     return moves
\ No newline at end of file
+        while frontier:
+            move, start, vertical = frontier.popleft()
+            for target, landing in vertical[start]:
+                target_bit = 1 << target
+                if target_bit & opp and landing >= 0 and (1 << landing) & empty:
+                    next_move = Move(src, move.path + (landing,), move.captured | target_bit)
+                    yield next_move
+                    frontier.append((next_move, landing, vertical))
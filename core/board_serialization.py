@@ -0,0 +1,187 @@
+"""
+Compact Board formats for disk and for passing positions between processes, for any board size.
+Only the pieces and the side to move are stored, the evaluation weights are the ones configured for the size.
+
+text, version 1: "ck1 <rows>x<cols> <squares> <side>"
+    squares: the dark squares of every row from the top separated by "/", p and c for the player's
+    and the computer's men, P and C for kings, "." for empty. side: p or c, the side to move.
+    e.g. the 8x8 opening: "ck1 8x8 cccc/cccc/cccc/..../..../pppp/pppp/pppp p"
+
+binary record: side to move byte (0 player, 1 computer), then player, computer and king bits,
+    each little endian in get_bits_size() bytes
+binary position: RECORD_HEADER (magic, version, rows, cols) + one record
+binary batch: BATCH_HEADER (magic, version, rows, cols, count) + count records, read in place by PositionBatch
+"""
+
+from .board import Board
+from .board_tables import get_board_tables
+from .evaluation import EvalWeights, get_eval_weights
+from .piece import PieceSide
+import struct
+
+TEXT_PREFIX = "ck1"
+MAGIC = b"CKP"
+BATCH_MAGIC = b"CKPB"
+VERSION = 1
+RECORD_HEADER = struct.Struct("<3sBBB")
+BATCH_HEADER = struct.Struct("<4sBBBI")
+SIDES = (PieceSide.PLAYER, PieceSide.COMPUTER)
+
+# empty board per (rows, cols, weights), decoded positions are copies of it
+_templates: dict[tuple[int, int, EvalWeights], Board] = {}
+
+def get_bits_size(total_rows:int, total_cols:int)->int:
+    """
+    bytes of one bitboard of the size, ghost bits included
+    """
+    return (get_board_tables(total_rows, total_cols).square_count + 7) // 8
+
+def get_record_size(total_rows:int, total_cols:int)->int:
+    return 1 + 3 * get_bits_size(total_rows, total_cols)
+
+def _new_board(total_rows:int, total_cols:int, eval_weights: EvalWeights | None)->Board:
+    """
+    a board of the size to set a position on, copied from a cached one instead of setting up the opening each time
+    """
+    weights = eval_weights if eval_weights is not None else get_eval_weights(total_rows)
+    template = _templates.get((total_rows, total_cols, weights))
+    if template is None:
+        template = Board(total_rows, total_cols, weights)
+        _templates[(total_rows, total_cols, weights)] = template
+    return template.copy()
+
+def board_to_text(board: Board)->str:
+    rows = []
+    for row in range(board.total_rows):
+        row_text = ""
+        for col in range((row + 1) % 2, board.total_cols, 2):
+            bit = board.get_square_bit(row, col)
+            char = "p" if board.player_bits & bit else "c" if board.computer_bits & bit else "."
+            row_text += char.upper() if board.king_bits & bit else char
+        rows.append(row_text)
+    side = "p" if board.side_to_move == PieceSide.PLAYER else "c"
+    return f"{TEXT_PREFIX} {board.total_rows}x{board.total_cols} {'/'.join(rows)} {side}"
+
+def board_from_text(text:str, eval_weights: EvalWeights | None = None)->Board:
+    fields = text.split()
+    if len(fields) != 4 or fields[0] != TEXT_PREFIX:
+        raise Exception(f"Not a position of version {TEXT_PREFIX}: {text}")
+    total_rows, total_cols = (int(value) for value in fields[1].split("x"))
+    rows = fields[2].split("/")
+    if len(rows) != total_rows or any(len(row) != total_cols // 2 for row in rows) or fields[3] not in ("p", "c"):
+        raise Exception(f"Position does not fit a {total_rows}x{total_cols} board: {text}")
+
+    board = _new_board(total_rows, total_cols, eval_weights)
+    player_bits = computer_bits = king_bits = 0
+    for row, row_text in enumerate(rows):
+        for i, char in enumerate(row_text):
+            bit = board.get_square_bit(row, 2 * i + (row + 1) % 2)
+            if char in "pP":
+                player_bits |= bit
+            elif char in "cC":
+                computer_bits |= bit
+            elif char != ".":
+                raise Exception(f"Unknown square {char} in position {text}")
+            if char in "PC":
+                king_bits |= bit
+    board.set_position(player_bits, computer_bits, king_bits, PieceSide.PLAYER if fields[3] == "p" else PieceSide.COMPUTER)
+    return board
+
+def _write_record(board: Board, buffer, offset:int, bits_size:int):
+    buffer[offset] = SIDES.index(board.side_to_move)
+    offset += 1
+    for bits in (board.player_bits, board.computer_bits, board.king_bits):
+        buffer[offset:offset + bits_size] = bits.to_bytes(bits_size, "little")
+        offset += bits_size
+
+def _read_record(buffer, offset:int, bits_size:int)->tuple[int, int, int, PieceSide]:
+    """
+    returns (player bits, computer bits, king bits, side to move) of the record at offset
+    """
+    side = SIDES[buffer[offset]]
+    offset += 1
+    player_bits = int.from_bytes(buffer[offset:offset + bits_size], "little")
+    computer_bits = int.from_bytes(buffer[offset + bits_size:offset + 2 * bits_size], "little")
+    king_bits = int.from_bytes(buffer[offset + 2 * bits_size:offset + 3 * bits_size], "little")
+    return player_bits, computer_bits, king_bits, side
+
+def board_to_bytes(board: Board)->bytes:
+    bits_size = get_bits_size(board.total_rows, board.total_cols)
+    data = bytearray(RECORD_HEADER.size + 1 + 3 * bits_size)
+    RECORD_HEADER.pack_into(data, 0, MAGIC, VERSION, board.total_rows, board.total_cols)
+    _write_record(board, data, RECORD_HEADER.size, bits_size)
+    return bytes(data)
+
+def board_from_bytes(data, eval_weights: EvalWeights | None = None)->Board:
+    """
+    data: bytes, bytearray or memoryview of board_to_bytes()
+    """
+    magic, version, total_rows, total_cols = RECORD_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise Exception("Not a binary position of this version")
+    board = _new_board(total_rows, total_cols, eval_weights)
+    board.set_position(*_read_record(memoryview(data), RECORD_HEADER.size, get_bits_size(total_rows, total_cols)))
+    return board
+
+def get_batch_size(total_rows:int, total_cols:int, count:int)->int:
+    """
+    bytes pack_positions() needs for count positions, e.g. to allocate shared memory
+    """
+    return BATCH_HEADER.size + count * get_record_size(total_rows, total_cols)
+
+def pack_positions(boards: list[Board], buffer = None)->bytearray | memoryview:
+    """
+    writes the positions, all of one size, as a binary batch into buffer (a bytearray, memoryview or
+    shared memory buf of at least get_batch_size() bytes) or into a new bytearray, and returns it
+    """
+    total_rows, total_cols = boards[0].total_rows, boards[0].total_cols
+    if buffer is None:
+        buffer = bytearray(get_batch_size(total_rows, total_cols, len(boards)))
+    BATCH_HEADER.pack_into(buffer, 0, BATCH_MAGIC, VERSION, total_rows, total_cols, len(boards))
+    bits_size = get_bits_size(total_rows, total_cols)
+    record_size = 1 + 3 * bits_size
+    offset = BATCH_HEADER.size
+    for board in boards:
+        if board.total_rows != total_rows or board.total_cols != total_cols:
+            raise Exception("Every position of a batch must have the same board size")
+        _write_record(board, buffer, offset, bits_size)
+        offset += record_size
+    return buffer
+
+class PositionBatch:
+    """
+    Read-only view of a binary batch of positions in a buffer, nothing is copied until a position is read.
+    The buffer can be bytes, a bytearray, a memoryview or the buf of a multiprocessing shared memory block.
+    """
+    def __init__(self, buffer, eval_weights: EvalWeights | None = None):
+        self.buffer = memoryview(buffer)
+        magic, version, self.total_rows, self.total_cols, self.count = BATCH_HEADER.unpack_from(self.buffer, 0)
+        if magic != BATCH_MAGIC or version != VERSION:
+            raise Exception("Not a position batch of this version")
+        self.bits_size = get_bits_size(self.total_rows, self.total_cols)
+        self.record_size = 1 + 3 * self.bits_size
+        if len(self.buffer) < BATCH_HEADER.size + self.count * self.record_size:
+            raise Exception("Position batch is truncated")
+        self.eval_weights = eval_weights
+
+    def __len__(self)->int:
+        return self.count
+
+    def get_bits(self, index:int)->tuple[int, int, int, PieceSide]:
+        """
+        returns (player bits, computer bits, king bits, side to move) without building a Board
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return _read_record(self.buffer, BATCH_HEADER.size + index * self.record_size, self.bits_size)
+
+    def __getitem__(self, index:int)->Board:
+        board = _new_board(self.total_rows, self.total_cols, self.eval_weights)
+        board.set_position(*self.get_bits(index))
+        return board
+
+    def release(self):
+        """
+        releases the view, needed before a shared memory block it points into can be closed
+        """
+        self.buffer.release()
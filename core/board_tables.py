@@ -0,0 +1,66 @@
+class BoardTables:
+    """
+    Lookup tables of one board size, indexed by square index (the position of the square bit):
+        up[square], down[square]: (step square, jump landing square or -1) for the left and the right
+            diagonal in that vertical direction, only for diagonals that stay on the board
+        coors[square]: (row, col) of the square, None for ghost bits
+    and the masks of the dark squares, the promotion rows and the starting pieces.
+    """
+    def __init__(self, total_rows:int, total_cols:int):
+        half = total_cols // 2
+        self.total_rows = total_rows
+        self.total_cols = total_cols
+        self.valid_mask = 0
+        self.promotion_mask = 0
+        self.player_start = 0
+        self.computer_start = 0
+
+        index_of:dict[tuple[int, int], int] = {}
+        for row in range(total_rows):
+            for col in range(total_cols):
+                if (row + col) % 2 == 0:
+                    continue
+                index = row * half + row // 2 + col // 2
+                index_of[(row, col)] = index
+                bit = 1 << index
+                self.valid_mask |= bit
+                if row == 0 or row == total_rows - 1:
+                    self.promotion_mask |= bit
+                if row < total_rows // 2 - 1:
+                    self.computer_start |= bit
+                elif row > total_rows // 2:
+                    self.player_start |= bit
+
+        # one past the last dark square, ghost bits included
+        self.square_count = self.valid_mask.bit_length()
+        self.coors:list[tuple[int, int] | None] = [None] * self.square_count
+        for square, index in index_of.items():
+            self.coors[index] = square
+
+        def diagonals(row:int, col:int, row_step:int)->tuple[tuple[int, int], ...]:
+            ret = []
+            for col_step in (-1, 1):
+                step = index_of.get((row + row_step, col + col_step))
+                if step is None:
+                    continue
+                jump = index_of.get((row + 2 * row_step, col + 2 * col_step), -1)
+                ret.append((step, jump))
+            return tuple(ret)
+
+        self.up:list[tuple[tuple[int, int], ...]] = [()] * self.square_count
+        self.down:list[tuple[tuple[int, int], ...]] = [()] * self.square_count
+        for (row, col), index in index_of.items():
+            self.up[index] = diagonals(row, col, -1)
+            self.down[index] = diagonals(row, col, 1)
+
+_tables_by_size: dict[tuple[int, int], BoardTables] = {}
+
+def get_board_tables(total_rows:int, total_cols:int)->BoardTables:
+    """
+    tables are built the first time a size is used and kept for the rest of the process
+    """
+    tables = _tables_by_size.get((total_rows, total_cols))
+    if tables is None:
+        tables = BoardTables(total_rows, total_cols)
+        _tables_by_size[(total_rows, total_cols)] = tables
+    return tables
@@ -0,0 +1,106 @@
+from .board_tables import get_board_tables
+
+class EvalWeights:
+    """
+    Weights of the evaluation terms, in hundredths of a man:
+        man, king: material value of a piece
+        advancement: bonus of a man one row before promotion, less the further back it is
+        centre: bonus of a man on the centre columns, less towards the sides
+        back_rank: bonus of a man still guarding its own back row
+        king_mobility: bonus of a king with every step and jump square on the board, less near edges and corners
+    """
+    CONFIG_KEYS = ("man", "king", "advancement", "centre", "back-rank", "king-mobility")
+
+    def __init__(self, man:int = 100, king:int = 200, advancement:int = 20, centre:int = 10,
+                 back_rank:int = 15, king_mobility:int = 20):
+        self.man = man
+        self.king = king
+        self.advancement = advancement
+        self.centre = centre
+        self.back_rank = back_rank
+        self.king_mobility = king_mobility
+
+    def key(self)->tuple[int, ...]:
+        return (self.man, self.king, self.advancement, self.centre, self.back_rank, self.king_mobility)
+
+    def updated(self, config:dict)->"EvalWeights":
+        """
+        returns a copy with the weights found in the config section replaced
+        """
+        values = dict(zip(EvalWeights.CONFIG_KEYS, self.key()))
+        for name in EvalWeights.CONFIG_KEYS:
+            if name in config:
+                values[name] = int(config[name])
+        return EvalWeights(*values.values())
+
+    def __eq__(self, other)->bool:
+        return isinstance(other, EvalWeights) and self.key() == other.key()
+
+    def __hash__(self)->int:
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"EvalWeights{self.key()}"
+
+class EvalTables:
+    """
+    Piece-square tables of one board size, indexed by square index. Player values are negated,
+    so the evaluation (computer minus player) is the plain sum over every piece on the board.
+    """
+    def __init__(self, total_rows:int, total_cols:int, weights: EvalWeights):
+        tables = get_board_tables(total_rows, total_cols)
+        self.weights = weights
+        self.player_man = [0] * tables.square_count
+        self.player_king = [0] * tables.square_count
+        self.computer_man = [0] * tables.square_count
+        self.computer_king = [0] * tables.square_count
+
+        for index, coor in enumerate(tables.coors):
+            if coor is None:
+                continue
+            row, col = coor
+            centre = weights.centre * (total_cols - 1 - abs(2 * col - (total_cols - 1))) // max(total_cols - 2, 1)
+            targets = tables.up[index] + tables.down[index]
+            mobility = len(targets) + sum(1 for _, jump in targets if jump >= 0)
+            king = weights.king + weights.king_mobility * mobility // 8
+
+            # the computer starts at the top and promotes on the last row, the player the other way round
+            for advance, sign, men, kings in ((row, 1, self.computer_man, self.computer_king),
+                                             (total_rows - 1 - row, -1, self.player_man, self.player_king)):
+                value = weights.man + weights.advancement * advance // max(total_rows - 1, 1) + centre
+                if advance == 0:
+                    value += weights.back_rank
+                men[index] = sign * value
+                kings[index] = sign * king
+
+_weights_by_size: dict[int | None, EvalWeights] = {}
+_tables_by_key: dict[tuple, EvalTables] = {}
+
+def configure_eval_weights(config:dict):
+    """
+    config: game config, the [EVAL] section holds the weights of every board size
+    and an [EVAL NxN] section overrides them for that size
+    """
+    _weights_by_size.clear()
+    default = EvalWeights().updated(config.get("EVAL", {}))
+    _weights_by_size[None] = default
+    for section, values in config.items():
+        if not section.startswith("EVAL "):
+            continue
+        size = section[len("EVAL "):].split("x")[0]
+        _weights_by_size[int(size)] = default.updated(values)
+
+def get_eval_weights(total_rows:int)->EvalWeights:
+    weights = _weights_by_size.get(total_rows) or _weights_by_size.get(None)
+    return weights if weights is not None else EvalWeights()
+
+def get_eval_tables(total_rows:int, total_cols:int, weights: EvalWeights)->EvalTables:
+    """
+    tables are built the first time a size and weights are used and kept for the rest of the process
+    """
+    key = (total_rows, total_cols, weights.key())
+    tables = _tables_by_key.get(key)
+    if tables is None:
+        tables = EvalTables(total_rows, total_cols, weights)
+        _tables_by_key[key] = tables
+    return tables
@@ -0,0 +1,35 @@
+class Move:
+    """
+    A move as square indexes of the board bitboards:
+        src: square the piece starts on
+        path: every square the piece lands on, one for a step, one per jump for a capture chain
+        captured: bits of the captured pieces
+    Moves are equal when they start and end on the same squares and capture the same pieces.
+    """
+    __slots__ = ("src", "path", "captured")
+
+    def __init__(self, src:int, path:tuple[int, ...], captured:int = 0):
+        self.src = src
+        self.path = path
+        self.captured = captured
+
+    @property
+    def dst(self)->int:
+        return self.path[-1]
+
+    def __eq__(self, other)->bool:
+        if not isinstance(other, Move):
+            return False
+        return self.src == other.src and self.path[-1] == other.path[-1] and self.captured == other.captured
+
+    def __hash__(self)->int:
+        return hash((self.src, self.path[-1], self.captured))
+
+    def __getstate__(self):
+        return self.src, self.path, self.captured
+
+    def __setstate__(self, state):
+        self.src, self.path, self.captured = state
+
+    def __repr__(self):
+        return f"Move({self.src}, {self.path}, {bin(self.captured)})"
@@ -1,4 +1,3 @@
-import pygame
 from enum import Enum
 
 class PieceSide(Enum):
@@ -6,18 +5,24 @@ class PieceSide(Enum):
     COMPUTER = 2
 
 class Piece:
-    def __init__(self, row: int, col: int, side: PieceSide):
-        self.row = row
-        self.col = col
-        self.side = side
-        self.king = False
+    """
+    Immutable piece kind. The board keeps positions in its bitboards, so only the four
+    (side, king) combinations exist and they are shared: use Piece.get(side, king).
+    """
+    __slots__ = ("side", "king")
 
-    def make_king(self):
-        self.king = True
+    def __init__(self, side: PieceSide, king: bool = False):
+        object.__setattr__(self, "side", side)
+        object.__setattr__(self, "king", king)
 
-    def move(self, row, col):
-        self.row = row
-        self.col = col
+    def __setattr__(self, name, value):
+        raise AttributeError("Piece is immutable")
+
+    @staticmethod
+    def get(side: PieceSide, king: bool)->"Piece":
+        return _PIECES[(side, king)]
 
     def __repr__(self):
-        return str(self.side)
\ No newline at end of file
+        return str(self.side)
+
+_PIECES = {(side, king): Piece(side, king) for side in PieceSide for king in (False, True)}
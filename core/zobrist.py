@@ -0,0 +1,28 @@
+import random
+
+ZOBRIST_SEED = 0x5EED_C0DE
+
+class ZobristKeys:
+    """
+    random 64-bit keys for every (square, piece kind) and for the side to move.
+    keys are seeded so every process gets the same hashes for the same position
+    """
+    def __init__(self, square_count:int):
+        rng = random.Random(ZOBRIST_SEED + square_count)
+        self.player_man = [rng.getrandbits(64) for _ in range(square_count)]
+        self.player_king = [rng.getrandbits(64) for _ in range(square_count)]
+        self.computer_man = [rng.getrandbits(64) for _ in range(square_count)]
+        self.computer_king = [rng.getrandbits(64) for _ in range(square_count)]
+        self.computer_to_move = rng.getrandbits(64)
+
+_keys_by_size: dict[int, ZobristKeys] = {}
+
+def get_zobrist_keys(square_count:int)->ZobristKeys:
+    """
+    square_count: number of bits used by the board, keys are shared by all boards of that size
+    """
+    keys = _keys_by_size.get(square_count)
+    if keys is None:
+        keys = ZobristKeys(square_count)
+        _keys_by_size[square_count] = keys
+    return keys
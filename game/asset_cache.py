@@ -0,0 +1,86 @@
+from common.singleton import SingletonMeta
+from collections import OrderedDict
+from typing import Any, Callable
+import pygame
+import logging
+
+logger = logging.getLogger(__name__)
+
+# what a font is counted as, its glyph cache is not visible from pygame
+FONT_BYTES = 64 * 1024
+
+class AssetCache(metaclass=SingletonMeta):
+    """
+    Images, scaled images, board backgrounds, fonts and rendered texts shared by every game object,
+    so a restart or a size change does not read files or redo drawing that was already done.
+    Entries are evicted least recently used first once they take more than max_mb.
+    """
+    def __init__(self, max_mb:int = 32):
+        self.max_bytes = max_mb * 1024 * 1024
+        self.entries:OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key:tuple, factory:Callable[[], Any])->Any:
+        """
+        returns the cached value of the key, made by factory() the first time
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = factory()
+        size = self._get_size(value)
+        self.entries[key] = (value, size)
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes and len(self.entries) > 1:
+            evicted_key, (_, evicted_size) = self.entries.popitem(last=False)
+            self.used_bytes -= evicted_size
+            logger.debug(f"Asset evicted: {evicted_key}")
+        return value
+
+    def get_image(self, path:str)->pygame.Surface:
+        return self.get(("image", path), lambda: self._load_image(path))
+
+    def get_scaled_image(self, path:str, size:tuple[int, int])->pygame.Surface:
+        return self.get(("scaled image", path, size), lambda: pygame.transform.scale(self.get_image(path), size))
+
+    def get_board_background(self, board_size:int, pixel_size:tuple[int, int],
+                             draw:Callable[[pygame.Surface], None])->pygame.Surface:
+        """
+        draw: paints the squares of the board on a surface of pixel_size, called once per board and pixel size
+        """
+        def make()->pygame.Surface:
+            surface = pygame.Surface(pixel_size)
+            draw(surface)
+            return surface
+        return self.get(("board background", board_size, pixel_size), make)
+
+    def get_font(self, name:str | None, size:int)->pygame.font.Font:
+        """
+        name: font file, None for pygame's default font
+        """
+        return self.get(("font", name, size), lambda: pygame.font.Font(name, size))
+
+    def get_text(self, text:str, font_name:str | None, font_size:int, color:tuple[int, int, int],
+                 antialias:bool = True)->pygame.Surface:
+        return self.get(("text", text, font_name, font_size, color, antialias),
+                        lambda: self.get_font(font_name, font_size).render(text, antialias, color))
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def _load_image(self, path:str)->pygame.Surface:
+        image = pygame.image.load(path)
+        # in the display's pixel format blits are faster, only possible once the window exists
+        return image.convert_alpha() if pygame.display.get_surface() is not None else image
+
+    def _get_size(self, value:Any)->int:
+        if isinstance(value, pygame.Surface):
+            return value.get_width() * value.get_height() * value.get_bytesize()
+        return FONT_BYTES
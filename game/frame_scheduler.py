@@ -0,0 +1,73 @@
+import pygame
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# frame time statistics are logged this often, in seconds
+STATS_INTERVAL_SEC = 10
+
+class FrameScheduler:
+    """
+    Paces the main loop: while something animates, frames run at up to max_fps; otherwise the loop sleeps
+    in pygame.event.wait until an event arrives or idle_wait_ms passes, so an idle window uses no CPU.
+    Events posted from other threads (pygame.event.post) wake it up at once.
+    """
+    def __init__(self, max_fps:int = 60, idle_wait_ms:int = 1000):
+        self.max_fps = max_fps
+        self.idle_wait_ms = idle_wait_ms
+        self.clock = pygame.time.Clock()
+        self.frame_start = time.perf_counter()
+        # work time of every frame since the last stats log, in seconds
+        self.frame_times:list[float] = []
+        self.active_frames = 0
+        self.idle_frames = 0
+        self.stats_start = time.perf_counter()
+
+    def wait_events(self, active:bool)->list[pygame.event.Event]:
+        """
+        ends the running frame and returns the events of the next one.
+        active: something animates or is pending, the next frame runs at the capped rate without waiting for events
+        """
+        self.frame_times.append(time.perf_counter() - self.frame_start)
+        if active:
+            self.active_frames += 1
+            self.clock.tick(self.max_fps)
+            events = pygame.event.get()
+        else:
+            self.idle_frames += 1
+            event = pygame.event.wait(self.idle_wait_ms)
+            events = [event] if event.type != pygame.NOEVENT else []
+            events += pygame.event.get()
+            # the idle wait is not part of the next active frame's interval
+            self.clock.tick()
+        self.frame_start = time.perf_counter()
+        if self.frame_start - self.stats_start >= STATS_INTERVAL_SEC:
+            logger.debug(f"Frames: {self.get_stats()}")
+            self._reset_stats()
+        return events
+
+    def get_stats(self)->dict[str, float]:
+        """
+        frames since the last stats log: counts, work time per frame percentiles in ms and the active frame rate
+        """
+        times = sorted(self.frame_times)
+        if not times:
+            return {}
+        def percentile(p:int)->float:
+            return times[min(len(times) - 1, int(p / 100 * len(times)))] * 1000
+        return {
+            "frames": len(times),
+            "active_frames": self.active_frames,
+            "idle_frames": self.idle_frames,
+            "work_ms_p50": percentile(50),
+            "work_ms_p95": percentile(95),
+            "work_ms_max": times[-1] * 1000,
+            "active_fps": self.clock.get_fps(),
+        }
+
+    def _reset_stats(self):
+        self.frame_times = []
+        self.active_frames = 0
+        self.idle_frames = 0
+        self.stats_start = time.perf_counter()
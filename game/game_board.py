@@ -3,6 +3,7 @@ import logging
 from core.piece import PieceSide
 from core.board import BoardData
 from .game_context import GameContext
+from .asset_cache import AssetCache
 from .game_object import VisibleGameObject
 from typing import Callable
 import os
@@ -19,13 +20,20 @@ OPPONENT_PIECE_IMG = 'assets/white_piece.png'
 OPPONENT_KING_IMG = 'assets/white_king.png'
     
 class GameBoard(VisibleGameObject):
+    """
+    Draws the board and keeps what it drew: set_board() repaints only the squares whose piece changed,
+    and every repainted square is added to the dirty rects for the display update.
+    """
     def __init__(self, board_data: BoardData,
                  board_left:int, board_top:int, board_width:int, board_height:int,
                  on_square_click:Callable[[tuple[int, int]], None] = lambda x: None):
         super().__init__(board_left, board_top, board_width, board_height)
         self.screen_context = GameContext()
+        self.asset_cache = AssetCache()
         self.on_square_click = on_square_click
         self.markers:list[tuple[int, int]] = []
+        # (side, king) of the piece drawn on every square, None for empty
+        self.drawn_pieces:list[list[tuple[PieceSide, bool] | None]] = []
         self._set_board(board_data)
         self._load_images(self.screen_context.get_root_path())
         self.draw()
@@ -42,13 +50,28 @@ class GameBoard(VisibleGameObject):
                     self.on_square_click(square_coor)
         
     def set_board(self, board_data: BoardData):
+        """
+        shows the board, repainting only the squares that differ from what is drawn.
+        The board may be the one already shown changed in place.
+        """
+        if board_data.get_size() != self.board_size:
+            self._set_board(board_data)
+            self.draw()
+            return
         self._set_board(board_data)
-        self.draw()
+        square_width = self.rect.width / self.board_size
+        square_height = self.rect.height / self.board_size
+        for row in range(self.board_size):
+            drawn_row = self.drawn_pieces[row]
+            for col in range(self.board_size):
+                if self._get_piece_key(row, col) != drawn_row[col]:
+                    self._redraw_square(row, col, square_width, square_height)
         
     def draw(self):
         self._draw_squares()
         self._draw_pieces()
         self._draw_markers()
+        self._mark_dirty(self.rect)
         
     def set_markers(self, markers:list[tuple[int, int]]):
         self.clear_markers()                
@@ -59,10 +82,10 @@ class GameBoard(VisibleGameObject):
         board_rect = self.rect
         square_width = board_rect.width / self.board_size
         square_height = board_rect.height / self.board_size
-        for row, col in self.markers:
-            self._draw_square(row, col, square_width, square_height)
-            
+        markers = self.markers
         self.markers = []
+        for row, col in markers:
+            self._redraw_square(row, col, square_width, square_height)
             
     def get_square_coor_by_pos(self, x:int, y:int)->tuple[int, int] | None:
         board_rect = self.rect
@@ -80,6 +103,23 @@ class GameBoard(VisibleGameObject):
     def _set_board(self, board_data: BoardData):
         self.board = board_data
         self.board_size = board_data.get_size()
+        if len(self.drawn_pieces) != self.board_size:
+            self.drawn_pieces = [[None] * self.board_size for _ in range(self.board_size)]
+
+    def _get_piece_key(self, row:int, col:int)->tuple[PieceSide, bool] | None:
+        piece = self.board[row][col]
+        return (piece.side, piece.king) if piece is not None else None
+
+    def _redraw_square(self, row:int, col:int, square_width:float, square_height:float):
+        """
+        repaints one square with its piece and marker
+        """
+        self._draw_square(row, col, square_width, square_height)
+        self._draw_piece(row, col, self.rect, square_width, square_height)
+        square_rect = self._get_square_rect(row, col, square_width, square_height)
+        if (row, col) in self.markers:
+            pygame.draw.rect(self.screen_context.get_window(), MARKER_COLOR, square_rect)
+        self._mark_dirty(square_rect)
 
     def _load_images(self, root_path:str):
         square_width = self.rect.width // self.board_size
@@ -87,29 +127,33 @@ class GameBoard(VisibleGameObject):
         piece_width = int(square_width / 2)
         piece_height = int(square_height / 2)
         
-        self.player_piece_img = pygame.image.load(os.path.join(root_path, PLAYER_PIECE_IMG))
-        self.player_piece_img = pygame.transform.scale(self.player_piece_img, (piece_width, piece_height))
-        
-        self.player_king_img = pygame.image.load(os.path.join(root_path, PLAYER_KING_IMG))
-        self.player_king_img = pygame.transform.scale(self.player_king_img, (piece_width, piece_height))
-        
-        self.opponent_piece_img = pygame.image.load(os.path.join(root_path, OPPONENT_PIECE_IMG))
-        self.opponent_piece_img = pygame.transform.scale(self.opponent_piece_img, (piece_width, piece_height))
-        
-        self.opponent_king_img = pygame.image.load(os.path.join(root_path, OPPONENT_KING_IMG))
-        self.opponent_king_img = pygame.transform.scale(self.opponent_king_img, (piece_width, piece_height))
+        piece_size = (piece_width, piece_height)
+        self.player_piece_img = self.asset_cache.get_scaled_image(os.path.join(root_path, PLAYER_PIECE_IMG), piece_size)
+        self.player_king_img = self.asset_cache.get_scaled_image(os.path.join(root_path, PLAYER_KING_IMG), piece_size)
+        self.opponent_piece_img = self.asset_cache.get_scaled_image(os.path.join(root_path, OPPONENT_PIECE_IMG), piece_size)
+        self.opponent_king_img = self.asset_cache.get_scaled_image(os.path.join(root_path, OPPONENT_KING_IMG), piece_size)
+
+    def _get_background(self)->pygame.Surface:
+        """
+        every square of the board drawn once per board size and pixel size
+        """
+        def draw(surface: pygame.Surface):
+            square_width = self.rect.width / self.board_size
+            square_height = self.rect.height / self.board_size
+            for row in range(self.board_size):
+                for col in range(self.board_size):
+                    square_rect = self._get_square_rect(row, col, square_width, square_height)
+                    square_color = SQUARE_COLOR_1 if (row + col) % 2 == 0 else SQUARE_COLOR_2
+                    pygame.draw.rect(surface, square_color, square_rect.move(-self.rect.left, -self.rect.top))
+        return self.asset_cache.get_board_background(self.board_size, self.rect.size, draw)
         
     def _draw_squares(self):
-        square_width = self.rect.width / self.board_size
-        square_height = self.rect.height / self.board_size
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                self._draw_square(row, col, square_width, square_height)
+        self.screen_context.get_window().blit(self._get_background(), self.rect)
                 
     def _draw_square(self, row:int, col:int, square_width:float, square_height:float):        
         square_rect = self._get_square_rect(row, col, square_width, square_height)
-        square_color = SQUARE_COLOR_1 if (row + col) % 2 == 0 else SQUARE_COLOR_2
-        pygame.draw.rect(self.screen_context.get_window(), square_color, square_rect)
+        self.screen_context.get_window().blit(self._get_background(), square_rect,
+                                              square_rect.move(-self.rect.left, -self.rect.top))
                 
     def _draw_pieces(self):
         board_rect = self.rect
@@ -122,6 +166,7 @@ class GameBoard(VisibleGameObject):
     def _draw_piece(self, row:int, col:int, board_rect:pygame.Rect, square_width:float, square_height:float):
         square_rect = self._get_square_rect(row, col, square_width, square_height)
         piece = self.board[row][col]
+        self.drawn_pieces[row][col] = (piece.side, piece.king) if piece is not None else None
         if piece is None:
             return
         if piece.side == PieceSide.PLAYER:
@@ -158,4 +203,5 @@ class GameBoard(VisibleGameObject):
         square_height = board_rect.height / self.board_size
         for row, col in self.markers:
             marker_rect = self._get_square_rect(row, col, square_width, square_height)
-            pygame.draw.rect(self.screen_context.get_window(), MARKER_COLOR, marker_rect)
\ No newline at end of file
+            pygame.draw.rect(self.screen_context.get_window(), MARKER_COLOR, marker_rect)
+            self._mark_dirty(marker_rect)
\ No newline at end of file
@@ -1,4 +1,5 @@
-from core.board import Board, PieceMove
+from core.board import Board
+from core.move import Move
 from core.piece import PieceSide
 from game.game_context import GameContext, GameEvent, GameEventType
 from game.game_board import GameBoard
@@ -10,9 +11,13 @@ from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import pygame
+import os
 
 logger = logging.getLogger(__name__)
 
+# posted when the computer's search ends, wakes the main loop waiting for events
+COMPUTER_MOVE_READY = pygame.event.custom_type()
+
 class GameState:
     @abstractmethod
     def update(self, events: list[pygame.event.Event] = []):
@@ -85,7 +90,7 @@ class PlayerGameState(GameState):
                 if not piece:
                     raise Exception("Invalid piece")
             
-                moves = cur_board.get_valid_moves(piece)
+                moves = cur_board.get_valid_moves(*square_clicked)
                 moves_pos = list(moves.keys())
                 markers_pos = []
                 for move_pos in moves_pos:
@@ -99,10 +104,7 @@ class PlayerGameState(GameState):
                 if self.last_selected_piece:
                     cur_renderer.clear_markers()
                     logger.debug(f"Moving piece: {self.last_selected_piece} to {square_clicked}")
-                    jump = self.possible_player_moves[square_clicked]
-                    if jump:
-                        cur_board.remove(jump)
-                    cur_board.move(self.last_selected_piece, square_clicked[0], square_clicked[1])
+                    cur_board.apply(self.possible_player_moves[square_clicked])
                     cur_renderer.set_board(cur_board)
                     self.possible_player_moves = {}
                     self.last_selected_piece = None
@@ -123,13 +125,39 @@ class ComputerGameState(GameState):
         self.counter = 0
         self.checker_minimax = CheckerMinimax(int(game_config["computer-max-depth"]), 
                                               int(game_config["computer-limit-sec"]),
-                                              eval(game_config["computer-alpha-beta"]))
+                                              eval(game_config["computer-alpha-beta"]),
+                                              int(game_config.get("computer-tt-size-mb", 64)),
+                                              workers=int(game_config.get("computer-workers", 1)),
+                                              batch_leaf_eval=eval(game_config.get("computer-batch-leaf-eval", "False")),
+                                              tablebase_path=self._get_data_path(game_config, "computer-tablebase"),
+                                              opening_book_path=self._get_data_path(game_config, "computer-opening-book"),
+                                              time_log_folder=self._get_log_folder(),
+                                              telemetry_format=GameContext().get_config()["LOG"].get("minimax-telemetry", "off"))
+        
+        self.ponder = eval(game_config.get("computer-ponder", "False"))
         
         self.executor = ThreadPoolExecutor(max_workers=1)
         self.running = False
+        self.closed = False
         
         super().__init__()
     
+    def _get_data_path(self, game_config:dict, key:str)->str | None:
+        """
+        returns the path of a precomputed data file of the config, {size} is replaced by the board size
+        """
+        if not game_config.get(key):
+            return None
+        board_size = GameContext().get_board_size()
+        path = game_config[key].format(size=board_size)
+        return os.path.join(GameContext().get_root_path(), path)
+
+    def _get_log_folder(self)->str | None:
+        log_config = GameContext().get_config()["LOG"]
+        if 'minimax-time-log-folder' not in log_config:
+            return None
+        return os.path.join(GameContext().get_root_path(), log_config['minimax-time-log-folder'])
+
     def update(self, events: list[pygame.event.Event] = []):
         if self.running:
             return
@@ -154,41 +182,54 @@ class ComputerGameState(GameState):
         else:
             self.counter -= 1
     
+    def start_pondering(self, board: Board):
+        """
+        searches the replies to the player's possible moves while the player thinks, board: position with the player to move
+        """
+        if not self.ponder:
+            return
+        logger.debug("Computer start pondering")
+        self.executor.submit(self.checker_minimax.ponder, board.copy())
+
+    def close(self):
+        """
+        ends the running search or pondering and releases the executor and search workers,
+        the search stops within a few hundred nodes so the wait is short
+        """
+        self.closed = True
+        # not stop(): a search queued by get_best_moves would clear it when it starts
+        self.checker_minimax.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.checker_minimax.close()
+
     def get_best_moves(self):
         self.running = True
         cur_board = self.context.get_board()
+        # the pondering running on the executor ends before this search starts
+        self.checker_minimax.stop()
         
         future = self.executor.submit(self._calculate_best_moves, cur_board)
-        future.add_done_callback(lambda future: self._handle_best_moves(*future.result()))
+        future.add_done_callback(lambda future: future.cancelled() or self._handle_best_moves(*future.result()))
         
-    def _calculate_best_moves(self, cur_state: Board)->tuple[PieceMove, Board, Board]:
+    def _calculate_best_moves(self, cur_state: Board)->tuple[Move, Board, Board]:
         logger.debug("Computer start thinking")
         best_move, best_state = self.checker_minimax.find_best_checker_move(cur_state)
         
         return best_move, best_state, cur_state
     
-    def _handle_best_moves(self, best_move: PieceMove, best_state: Board, cur_state: Board):
+    def _handle_best_moves(self, best_move: Move, best_state: Board, cur_state: Board):
+        if self.closed:
+            return
         try:
             logger.debug("Computer end thinking and start moving")
-            moves = []
-            move_pos = []
-            while best_move:
-                # ignore root move
-                if not best_move.before:
-                    break
-                
-                logger.debug(f"Move: {(best_move.row, best_move.col)}")
-                move_pos.append((best_move.row, best_move.col))
-                moves.append(cur_state.get_state_from_move(best_move))
-                best_move = best_move.before
-            
-            move_pos.reverse()
+            # the start square is not a step to show
+            move_pos = cur_state.get_move_coors(best_move)[1:]
             print(f"Computer moves: {move_pos}")
-        
-            moves.reverse()
-            self.cur_moves.extend(moves)
+
+            self.cur_moves.extend(cur_state.get_move_states(best_move))
         finally:
             self.running = False
+            pygame.event.post(pygame.event.Event(COMPUTER_MOVE_READY))
                    
 class BoardGameController(GameStateContext, GameObject):
     def __init__(self, board:Board, game_board: GameBoard, game_context: GameContext):
@@ -197,7 +238,6 @@ class BoardGameController(GameStateContext, GameObject):
         self.game_context = game_context
         self.game_board = game_board
         self.game_board.on_square_click = self._handle_square_click
-        self.clock = pygame.time.Clock()
         self.current_state:GameState
         self._init_states()
 
@@ -211,6 +251,7 @@ class BoardGameController(GameStateContext, GameObject):
             self.game_context.push_event(GameEvent(GameEventType.CHANGE_TURN, "Computer"))
         else:
             self.game_context.push_event(GameEvent(GameEventType.CHANGE_TURN, "Player"))
+            self.states[GameStates.COMPUTER_TURN].start_pondering(self.board) # type: ignore
         
     def get_board(self)->Board:
         return self.board
@@ -221,10 +262,23 @@ class BoardGameController(GameStateContext, GameObject):
     
     def get_board_renderer(self)->GameBoard:
         return self.game_board
+
+    def is_animating(self)->bool:
+        """
+        the computer is about to search or is showing its move step by step, so frames have to keep coming;
+        while it searches or the player thinks the main loop can wait for events
+        """
+        return isinstance(self.current_state, ComputerGameState) and not self.current_state.running
     
     def update(self, events: list[pygame.event.Event] = []):
         self.current_state.update(events)
         
+    def close(self):
+        """
+        stops the computer's search, called before the controller is replaced
+        """
+        self.states[GameStates.COMPUTER_TURN].close() # type: ignore
+
     def _handle_square_click(self, square_coor: tuple[int, int]):
         self.clicked_square = square_coor
         logger.debug(f"Square clicked: {square_coor}")
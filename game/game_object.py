@@ -12,7 +12,17 @@ class GameObject(ABC):
 class VisibleGameObject(GameObject):
     def __init__(self, pos_x:int, pos_y:int, width:int, height:int):
         self.rect = pygame.Rect(pos_x, pos_y, width, height)
+        # screen areas drawn since the last pop_dirty_rects(), only they need a display update
+        self.dirty_rects:list[pygame.Rect] = []
         super().__init__()
+
+    def pop_dirty_rects(self)->list[pygame.Rect]:
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        return rects
+
+    def _mark_dirty(self, rect: pygame.Rect):
+        self.dirty_rects.append(rect)
     
     def _get_local_mouse_pos(self):
         mouse_x, mouse_y = pygame.mouse.get_pos()
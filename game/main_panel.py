@@ -1,5 +1,6 @@
 from .game_object import VisibleGameObject
 from .game_context import GameContext, GameEvent, GameEventType
+from .asset_cache import AssetCache
 import pygame
 import logging
 
@@ -7,6 +8,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 PANEL_COLOR = (151, 126, 59)
+TEXT_COLOR = (0, 0, 0)
+FONT_SIZE = 36
                     
 class MainPanel(VisibleGameObject):
     _RESTART_BUTTON_X = 10
@@ -16,6 +19,7 @@ class MainPanel(VisibleGameObject):
         super().__init__(x, y, width, height)
         self.game_context = GameContext()
         self.surface = self.game_context.get_window()
+        self.asset_cache = AssetCache()
         
         self.turn_text = ""
         self.size_text = ""
@@ -41,6 +45,7 @@ class MainPanel(VisibleGameObject):
                     
     def draw(self):
         pygame.draw.rect(self.surface, PANEL_COLOR, self.rect)
+        self._mark_dirty(self.rect)
         
        
         self._draw_turn_text()
@@ -62,28 +67,26 @@ class MainPanel(VisibleGameObject):
         self.surface.blit(self.size_down_btn, self.size_down_btn_rect.move(self.rect.left, self.rect.top))
     
     def _draw_size_text(self):
-        font = pygame.font.Font(None, 36)
-        text = font.render(self.size_text, True, (0, 0, 0))
+        text = self.asset_cache.get_text(self.size_text, None, FONT_SIZE, TEXT_COLOR)
         text_rect = text.get_rect()
         text_rect.center = (self.rect.left + self.rect.width // 2 - 5, self.rect.bottom - 100)
         self.surface.blit(text, text_rect)
     
     def _draw_turn_text(self):
-        font = pygame.font.Font(None, 36)
-        text = font.render(self.turn_text, True, (0, 0, 0))
+        text = self.asset_cache.get_text(self.turn_text, None, FONT_SIZE, TEXT_COLOR)
         text_rect = text.get_rect()
         text_rect.center = (self.rect.left + self.rect.width // 2, self.rect.top + 50)
         self.surface.blit(text, text_rect)     
     
     def _load_buttons_images(self, root_path:str):
-        self.restart_btn = pygame.image.load(f"{root_path}/assets/buttons/restart/normal.png")
+        self.restart_btn = self.asset_cache.get_image(f"{root_path}/assets/buttons/restart/normal.png")
         self.restart_btn_rect = self.restart_btn.get_rect()
         self.restart_btn_rect.center = (self.rect.width // 2, self.rect.bottom - 50)
         
-        self.size_up_btn = pygame.image.load(f"{root_path}/assets/buttons/size_up/normal.png")
+        self.size_up_btn = self.asset_cache.get_image(f"{root_path}/assets/buttons/size_up/normal.png")
         self.size_up_btn_rect = self.size_up_btn.get_rect()
         self.size_up_btn_rect.center = (self.rect.width // 2, self.rect.bottom - 250)
         
-        self.size_down_btn = pygame.image.load(f"{root_path}/assets/buttons/size_down/normal.png")
+        self.size_down_btn = self.asset_cache.get_image(f"{root_path}/assets/buttons/size_down/normal.png")
         self.size_down_btn_rect = self.size_down_btn.get_rect()
         self.size_down_btn_rect.center = (self.rect.width // 2, self.rect.bottom - 190)
\ No newline at end of file
@@ -1,5 +1,8 @@
 from core.board import Board
+from core.evaluation import configure_eval_weights
 from game.game_context import GameContext, GameEventType
+from game.asset_cache import AssetCache
+from game.frame_scheduler import FrameScheduler
 from game.game_board import GameBoard
 from game.game_controller import BoardGameController
 from game.main_panel import MainPanel
@@ -24,62 +27,79 @@ config.read("game_config.ini")
 
 board_size = BOARD_SIZE_MIN
 
-pygame.init()
+def restart():
+    global board, game_board, game_controller
+    
+    game_controller.close()
+    board = Board(board_size, board_size)
+    game_context.set_board_size(board_size)
+    game_board = GameBoard(board, 0, 0, board_width, board_height)
+    game_controller = BoardGameController(board, game_board, game_context)
 
-# log to console
-logging.basicConfig(level=logging.DEBUG,stream=sys.stdout)
+# the search workers import this module again, only the game process runs the game
+if __name__ == "__main__":
+    pygame.init()
 
-logger = logging.getLogger(__name__)
+    # log to console
+    logging.basicConfig(level=logging.DEBUG,stream=sys.stdout)
 
-board = Board(board_size, board_size)
-game_context = GameContext()
-game_context.initialize(os.getcwd(), {s:dict(config.items(s)) for s in config.sections()})
-game_context.set_board_size(board_size)
+    logger = logging.getLogger(__name__)
 
-board_width = int(game_context.get_config()["WINDOW"]["board-width"])
-board_height = int(game_context.get_config()["WINDOW"]["board-height"])
-panel_width = int(game_context.get_config()["WINDOW"]["panel-width"])
-panel_height = int(game_context.get_config()["WINDOW"]["panel-height"])
+    game_context = GameContext()
+    game_context.initialize(os.getcwd(), {s:dict(config.items(s)) for s in config.sections()})
+    configure_eval_weights(game_context.get_config())
+    AssetCache(int(game_context.get_config()["WINDOW"].get("asset-cache-mb", 32)))
+    game_context.set_board_size(board_size)
+    board = Board(board_size, board_size)
 
-game_board = GameBoard(board, 0, 0, board_width, board_height)
-main_panel = MainPanel(board_width, 0, panel_width, panel_height)
-main_panel.set_size_text(f"{board_size}x{board_size}")
-main_panel.draw()
+    board_width = int(game_context.get_config()["WINDOW"]["board-width"])
+    board_height = int(game_context.get_config()["WINDOW"]["board-height"])
+    panel_width = int(game_context.get_config()["WINDOW"]["panel-width"])
+    panel_height = int(game_context.get_config()["WINDOW"]["panel-height"])
 
+    game_board = GameBoard(board, 0, 0, board_width, board_height)
+    main_panel = MainPanel(board_width, 0, panel_width, panel_height)
+    main_panel.set_size_text(f"{board_size}x{board_size}")
+    main_panel.draw()
 
-game_controller = BoardGameController(board, game_board, game_context)
 
-def restart():
-    global board, game_board, game_controller
-    
-    board = Board(board_size, board_size)
-    game_context.set_board_size(board_size)
-    game_board = GameBoard(board, 0, 0, board_width, board_height)
     game_controller = BoardGameController(board, game_board, game_context)
+    frame_scheduler = FrameScheduler(int(game_context.get_config()["WINDOW"].get("max-fps", 60)),
+                                     int(game_context.get_config()["WINDOW"].get("idle-wait-ms", 1000)))
 
-while True:
-    events = pygame.event.get()
-    for event in events:
-        if event.type == pygame.QUIT:
-            sys.exit()
+    active = True
+    while True:
+        events = frame_scheduler.wait_events(active)
+        exposed = False
+        for event in events:
+            if event.type == pygame.QUIT:
+                game_controller.close()
+                sys.exit()
+            elif event.type == pygame.WINDOWEXPOSED:
+                # the window was covered, only a full update brings back what the dirty rects do not cover
+                exposed = True
             
-    while game_context.has_event():
-        event = game_context.pop_event()
-        if event.get_type() == GameEventType.RESTART:
-            logger.debug("Restart event received")
-            restart()
-        elif event.get_type() == GameEventType.CHANGE_TURN:
-            logger.debug("Change turn event received")
-            data = event.get_data()
-            main_panel.set_turn_text(data)
-        elif event.get_type() == GameEventType.CHANGE_SIZE:
-            new_size = board_size + event.get_data()
-            if new_size >= BOARD_SIZE_MIN and new_size <= BOARD_SIZE_MAX:
-                board_size = new_size
-                main_panel.set_size_text(f"{board_size}x{board_size}")
+        while game_context.has_event():
+            event = game_context.pop_event()
+            if event.get_type() == GameEventType.RESTART:
+                logger.debug("Restart event received")
+                restart()
+            elif event.get_type() == GameEventType.CHANGE_TURN:
+                logger.debug("Change turn event received")
+                data = event.get_data()
+                main_panel.set_turn_text(data)
+            elif event.get_type() == GameEventType.CHANGE_SIZE:
+                new_size = board_size + event.get_data()
+                if new_size >= BOARD_SIZE_MIN and new_size <= BOARD_SIZE_MAX:
+                    board_size = new_size
+                    main_panel.set_size_text(f"{board_size}x{board_size}")
             
-    game_board.update(events=events)
-    game_controller.update(events=events)
-    main_panel.update(events=events)
-    pygame.display.update()
-    pygame.time.Clock().tick(60)
+        game_board.update(events=events)
+        game_controller.update(events=events)
+        main_panel.update(events=events)
+        dirty_rects = game_board.pop_dirty_rects() + main_panel.pop_dirty_rects()
+        if exposed:
+            pygame.display.update()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        active = game_controller.is_animating() or game_context.has_event()
@@ -1,100 +1,617 @@
-from copy import deepcopy
-from game.game_context import GameContext
-from core.game_state import GameState
-from core.board import Board, PieceMove
+from core.board import Board
+from core.move import Move
 from core.piece import PieceSide
+from core.batch_evaluation import get_batch_evaluator, is_batch_evaluation_available
+from .transposition_table import TranspositionTable, Bound
+from .move_ordering import MoveOrdering
+from .parallel_search import RootParallelSearch
+from .endgame_tablebase import EndgameTablebase, TABLEBASE_WIN_SCORE, TABLEBASE_WIN_MIN
+from .opening_book import OpeningBook
+from .search_telemetry import SearchStats, TelemetryLog
+from typing import Iterator
 import logging
+import threading
 import time
 import os
 
 logger = logging.getLogger(__name__)
 
+class SearchTimeout(Exception):
+    """
+    raised inside the search when the time budget is used up
+    """
+    pass
+
 class CheckerMinimax:
-    def __init__(self, max_depth:int, time_limit_sec:int, alpha_beta:bool = True):
-        print(alpha_beta)
-        self.max_depth = max_depth
+    # the clock is only read every this many nodes
+    TIME_CHECK_INTERVAL = 256
+    MAX_SEARCH_DEPTH = 64
+
+    def __init__(self, max_depth:int, time_limit_sec:int, alpha_beta:bool = True, tt_size_mb:int = 64,
+                 move_ordering:bool = True, workers:int = 1, batch_leaf_eval:bool = False,
+                 tablebase_path:str | None = None, opening_book_path:str | None = None,
+                 time_log_folder:str | None = None, telemetry_format:str = "off"):
+        """
+        max_depth: deepest iteration to search, 0 searches deeper until the time limit is reached
+        workers: number of processes the root moves are split across, 1 searches in the calling thread
+        batch_leaf_eval: score the leaves of a depth 1 node in one numpy call instead of playing each move
+        tablebase_path: endgame tablebase file probed during the search, ignored when it does not exist
+        opening_book_path: opening book file looked up before searching, ignored when it does not exist
+        time_log_folder: folder of the search time logs, None writes no log
+        telemetry_format: "jsonl" or "csv" to write a telemetry record per move to the log folder, "off" for none
+        """
+        self.max_depth = max_depth if max_depth > 0 else CheckerMinimax.MAX_SEARCH_DEPTH
         self.time_limit = time_limit_sec
         self.start_time = time.time()
         self.alpha_beta = alpha_beta
-        
-        log_config = GameContext().get_config()["LOG"]
-        if 'minimax-time-log-folder' in log_config:
-            self.time_log_folder = os.path.join(GameContext().get_root_path(), log_config['minimax-time-log-folder'])
-            
-    def find_best_checker_move(self, board: Board)->tuple[PieceMove, Board]:
+        self.nodes = 0
+        self.depth_reached = 0
+        self._iteration_best: Move | None = None
+        self.root_depth = 0
+        # lower bound of the root score every node's window starts from, raised by the other root moves
+        # of a parallel search: shared_alpha is the multiprocessing value it is read from
+        self.root_alpha = float('-inf')
+        self.shared_alpha = None
+        self.transposition_table = TranspositionTable(tt_size_mb) if tt_size_mb > 0 else None
+        self.move_ordering = MoveOrdering(CheckerMinimax.MAX_SEARCH_DEPTH) if move_ordering else None
+        self.tablebase = None
+        if tablebase_path and os.path.exists(tablebase_path):
+            self.tablebase = EndgameTablebase(tablebase_path)
+        elif tablebase_path:
+            # the default config names a file that is only there once it was built
+            logger.debug(f"No endgame tablebase at {tablebase_path}")
+        self.opening_book = None
+        if opening_book_path and os.path.exists(opening_book_path):
+            self.opening_book = OpeningBook(opening_book_path)
+        elif opening_book_path:
+            logger.debug(f"No opening book at {opening_book_path}")
+        self.parallel_search = RootParallelSearch(workers, alpha_beta, tt_size_mb, batch_leaf_eval,
+                                                  tablebase_path if self.tablebase else None) if workers > 1 else None
+        # cancellation token: set by stop() to end the running search early, shared with the parallel search workers
+        self.stop_event = self.parallel_search.stop_event if self.parallel_search else threading.Event()
+        # set by cancel(): the stop_event stays set for every later search too
+        self.cancelled = False
+        # pondering results: position hash -> (best move, deepest finished iteration, time pondering of the
+        # position started, whether the search ran in full instead of being stopped)
+        self.ponder_results:dict[int, tuple[Move, int, float, bool]] = {}
+        # best move of the deepest iteration the last _search finished
+        self._finished_best: Move | None = None
+        self.batch_leaf_eval = batch_leaf_eval
+        if batch_leaf_eval and not is_batch_evaluation_available():
+            logger.warning("numpy not found, leaves are scored one at a time")
+            self.batch_leaf_eval = False
+        self.stats: SearchStats | None = None
+        self.telemetry_log: TelemetryLog | None = None
+        # the plain Board methods unless telemetry is on, so the search pays nothing for it
+        self._apply, self._undo, self._heuristic = Board.apply, Board.undo, Board.heuristic
+        self.time_log_folder = time_log_folder
+        if time_log_folder and telemetry_format != "off":
+            self.enable_telemetry(TelemetryLog(time_log_folder, telemetry_format))
+
+    def enable_telemetry(self, telemetry_log: TelemetryLog):
+        """
+        collects the search counters and writes a record per find_best_checker_move call to the log
+        """
+        self.telemetry_log = telemetry_log
+        self.stats = SearchStats()
+        self._apply, self._undo, self._heuristic = self.stats.timed_apply, self.stats.timed_undo, self.stats.timed_heuristic
+
+    def find_best_checker_move(self, board: Board)->tuple[Move, Board]:
+        """
+        searches depth 1, 2, 3... until the time limit and returns the best move of the deepest
+        iteration that finished, or of an unfinished one when at least one root move was fully searched.
+        When the position was pondered the pondered search is used: its move at once when it ran in full,
+        else its iterative deepening goes on from the depth it reached with the time left since pondering started.
+        """
+        self.stop_event.clear()
+        # a cancel() that came while this call was starting would be lost by the clear
+        if self.cancelled:
+            self.stop_event.set()
         self.start_time = time.time()
-        
+        self.nodes = 0
+        self.depth_reached = 0
+        if self.stats:
+            self.stats.reset()
+        if self.opening_book:
+            book_move = self.opening_book.find_move(board)
+            if book_move is not None:
+                logger.debug(f"Book move found in {time.time() - self.start_time:.6f}s")
+                self._save_telemetry(board, "book", time.time() - self.start_time)
+                return book_move, board.get_state_from_move(book_move)
+        pondered = self.ponder_results.get(board.hash())
+        self.ponder_results.clear()
+        if pondered is not None:
+            pondered_move, pondered_depth, ponder_start, complete = pondered
+            if complete or pondered_depth >= self.max_depth or time.time() - ponder_start >= self.time_limit:
+                logger.debug(f"Move found while pondering, depth {pondered_depth}")
+                self.depth_reached = pondered_depth
+                self._save_telemetry(board, "ponder", time.time() - self.start_time)
+                return pondered_move, board.get_state_from_move(pondered_move)
+
+        call_start = self.start_time
+        if pondered is not None:
+            logger.debug(f"Resuming the pondered search after depth {pondered_depth}")
+            # the time budget counts from when pondering of the position started
+            self.start_time = ponder_start
+            self.depth_reached = pondered_depth
+            best_move = self._search(board, pondered_depth + 1, pondered_move)
+        else:
+            best_move = self._search(board)
+        self._save_time(board, time.time() - call_start)
+        self._save_telemetry(board, "ponder" if pondered is not None else "search", time.time() - call_start)
+
+        return best_move, board.get_state_from_move(best_move)
+
+    def ponder(self, board: Board):
+        """
+        runs during the player's turn, board: position with the player to move.
+        Searches the computer's reply to each player move, the predicted one first, until stop() is called.
+        The best move of the deepest finished iteration of each reply is kept for find_best_checker_move,
+        also for the reply being searched when stop() is called.
+        """
+        self.ponder_results.clear()
+        replies = board.get_moves(PieceSide.PLAYER)
+        predicted = None
+        if self.transposition_table:
+            entry = self.transposition_table.probe(board.hash())
+            predicted = entry[4] if entry is not None else None
+        if predicted in replies:
+            replies.remove(predicted)
+            replies.insert(0, predicted)
+
+        for reply in replies:
+            if self.stop_event.is_set():
+                return
+            reply_board = board.get_state_from_move(reply)
+            if reply_board.winner() != None or not reply_board.get_moves(PieceSide.COMPUTER):
+                continue
+            if self.opening_book and self.opening_book.find_move(reply_board) is not None:
+                continue
+            ponder_start = time.time()
+            self.start_time = ponder_start
+            self.nodes = 0
+            self.depth_reached = 0
+            best_move = self._search(reply_board)
+            stopped = self.stop_event.is_set()
+            if self.depth_reached > 0:
+                self.ponder_results[reply_board.hash()] = (best_move if not stopped else self._finished_best, # type: ignore
+                                                           self.depth_reached, ponder_start, not stopped)
+                logger.debug(f"Pondered {board.get_move_coors(reply)}: depth {self.depth_reached}")
+            if stopped:
+                return
+
+    def stop(self):
+        """
+        ends the running search or pondering early, can be called from another thread
+        """
+        self.stop_event.set()
+
+    def cancel(self):
+        """
+        stops the running search and every later one, which returns the first root move at once.
+        For shutting down: a search already queued on another thread must not run in full
+        """
+        self.cancelled = True
+        self.stop_event.set()
+
+    def new_search(self):
+        """
+        ages the transposition table and move ordering before a search of a new position
+        """
+        if self.transposition_table:
+            self.transposition_table.new_search()
+            self.transposition_table.reset_stats()
+        if self.move_ordering:
+            self.move_ordering.new_search()
+        if self.parallel_search:
+            self.parallel_search.new_search()
+
+    def _search(self, board: Board, first_depth:int = 1, first_move: Move | None = None)->Move:
+        """
+        first_depth, first_move: iteration to start from and best move of the one before it, to resume a search
+        """
+        self.new_search()
+        self._finished_best = None
+        # search one board in place, the caller's board is left untouched
+        search_board = board.copy()
+
+        root_moves = search_board.get_moves(PieceSide.COMPUTER)
+        if not root_moves:
+            raise Exception("Best move not found")
+
+        root_moves = self._order_moves(root_moves, 0, None)
+        if first_move in root_moves:
+            root_moves.remove(first_move)
+            root_moves.insert(0, first_move)
+        best_move = root_moves[0]
+        tablebase_move = self._get_tablebase_move(search_board, root_moves) if len(root_moves) > 1 else None
+        if tablebase_move is not None:
+            best_move = tablebase_move
+        elif len(root_moves) > 1:
+            for depth in range(first_depth, self.max_depth + 1):
+                if self.stop_event.is_set():
+                    break
+                self._iteration_best = None
+                try:
+                    best_move, best_score = self._search_root(search_board, root_moves, depth)
+                    self.depth_reached = depth
+                    self._finished_best = best_move
+                    logger.debug(f"Depth {depth} done, best score: {best_score}")
+                except SearchTimeout:
+                    logger.debug(f"Time limit reached at depth {depth}")
+                    if self._iteration_best is not None:
+                        best_move = self._iteration_best
+                    break
+
+                # search the best move first in the next iteration
+                root_moves.remove(best_move)
+                root_moves.insert(0, best_move)
+
+        if self.transposition_table:
+            logger.debug(f"Transposition table: {self.transposition_table.get_stats()}")
+
+        return best_move
+
+    def get_tt_stats(self)->dict[str, int | float]:
+        """
+        hit, miss and collision counters of the transposition table for the last search
+        """
+        if not self.transposition_table:
+            return {}
+        return self.transposition_table.get_stats()
+
+    def search_root_move(self, board: Board, move: Move, depth:int, alpha:float, deadline:float)->int|float:
+        """
+        scores one root move with the window (alpha, inf) until the deadline, used by the parallel search workers
+        """
+        self.start_time = time.time()
+        self.time_limit = deadline - self.start_time
+        self.nodes = 0
+        self.root_depth = depth
+        self.root_alpha = alpha
+        token = board.apply(move)
+        try:
+            return self._minimax(board, depth - 1, alpha=alpha, beta=float('inf'), max_player=False)
+        finally:
+            board.undo(token)
+
+    def close(self):
+        """
+        stops the worker processes of the parallel search and closes the tablebase and opening book,
+        call it once no search is running: cancel() first and wait for the search thread
+        """
+        self.cancel()
+        if self.parallel_search:
+            self.parallel_search.close()
+            self.parallel_search = None
+        if self.tablebase:
+            self.tablebase.close()
+            self.tablebase = None
+        if self.opening_book:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def _get_tablebase_move(self, board: Board, root_moves: list[Move])->Move | None:
+        """
+        returns the move with the best tablebase result when every root move is in the tablebase:
+        the quickest win, else a draw, else the slowest loss
+        """
+        if not self.tablebase or not self.tablebase.covers(board):
+            return None
+        best_move = None
+        best_score = float('-inf')
+        for move in root_moves:
+            token = board.apply(move)
+            try:
+                if not board.player_bits:
+                    score = TABLEBASE_WIN_SCORE - 1
+                else:
+                    score = self.tablebase.probe_score(board, PieceSide.PLAYER, 1)
+            finally:
+                board.undo(token)
+            if score is None:
+                return None
+            if score > best_score:
+                best_score = score
+                best_move = move
+        logger.debug(f"Tablebase move, score: {best_score}")
+        return best_move
+
+    def _search_root_parallel(self, board: Board, root_moves: list[Move], depth:int)->tuple[Move, int|float]:
+        scores, nodes = self.parallel_search.search_root(board, root_moves, depth, self.start_time + self.time_limit) # type: ignore
+        self.nodes += nodes
+
+        best_move = None
+        best_score = float('-inf')
+        for move, score in zip(root_moves, scores):
+            if score is not None and score > best_score:
+                best_score = score
+                best_move = move
+                self._iteration_best = move
+
+        if best_move is None or None in scores:
+            raise SearchTimeout()
+
+        return best_move, best_score
+
+    def _search_root(self, board: Board, root_moves: list[Move], depth:int)->tuple[Move, int|float]:
+        if self.parallel_search:
+            return self._search_root_parallel(board, root_moves, depth)
+
+        self.root_depth = depth
+        if self.stats:
+            self.stats.expanded += 1
         best_move = None
-        best_state = None
         best_score = float('-inf')
         alpha = float('-inf')
         beta = float('inf')
-        for move, board_state in board.get_all_moves_with_nodes(PieceSide.COMPUTER):        
-            score, _ = self._minimax(board_state, self.max_depth - 1, alpha=alpha, beta=beta, max_player=False)
+        for move in root_moves:
+            token = board.apply(move)
+            try:
+                score = self._minimax(board, depth - 1, alpha=alpha, beta=beta, max_player=False)
+            finally:
+                board.undo(token)
             if score > best_score:
-                logger.debug(f"Best score: {score}")
                 best_score = score
-                best_move = move            
-                best_state = board_state
+                best_move = move
+                self._iteration_best = move
             if self.alpha_beta:
                 alpha = max(alpha, score)
-                if beta <= alpha:
-                    break
-        if best_move is None or best_state is None:
+
+        if best_move is None:
             raise Exception("Best move not found")
-        
-        self._save_time(time.time() - self.start_time)
-        
-        return best_move, best_state
-    
-    def _minimax(self, game_state: GameState, depth:int, alpha:float, beta:float, max_player:bool)->tuple[int|float, GameState]:
-        if depth == 0 or game_state.winner() != None or time.time() - self.start_time > self.time_limit:
-            if time.time() - self.start_time > self.time_limit:
-                logger.debug("Time limit reached")
-            return game_state.heuristic(), game_state
+
+        return best_move, best_score
+
+    def _minimax(self, board: Board, depth:int, alpha:float, beta:float, max_player:bool)->int|float:
+        self.nodes += 1
+        if self.nodes % CheckerMinimax.TIME_CHECK_INTERVAL == 0:
+            if self._is_out_of_time():
+                raise SearchTimeout()
+            if self.shared_alpha is not None:
+                self.root_alpha = self.shared_alpha.value
+        if self.tablebase:
+            score = self.tablebase.probe_score(board, PieceSide.COMPUTER if max_player else PieceSide.PLAYER,
+                                               self.root_depth - depth)
+            if score is not None:
+                return score
+        if depth == 0 or board.winner() != None:
+            return self._heuristic(board)
+
+        if alpha < self.root_alpha:
+            alpha = self.root_alpha
+        key = board.hash()
+        pv_move = None
+        ply = self.root_depth - depth
+        if self.transposition_table:
+            entry = self.transposition_table.probe(key)
+            if entry is not None:
+                pv_move = entry[4]
+            if entry is not None and entry[1] >= depth:
+                score, bound = self._from_tt_score(entry[2], ply), entry[3]
+                if bound == Bound.EXACT:
+                    return score
+                if self.alpha_beta:
+                    if bound == Bound.LOWER:
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        return score
+        alpha_orig, beta_orig = alpha, beta
+        if self.stats:
+            self.stats.expanded += 1
+        if depth == 1 and self.batch_leaf_eval:
+            return self._minimax_horizon(board, key, alpha, beta, max_player, ply, pv_move)
         try:
             if max_player:
                 maxEval = float('-inf')
                 best_move = None
-                for move in game_state.get_all_moves(PieceSide.COMPUTER):
-                    evaluation = self._minimax(move, depth-1, alpha, beta, False)[0]
+                for move_index, move in enumerate(self._iter_moves(board, PieceSide.COMPUTER, ply, pv_move)):
+                    token = self._apply(board, move)
+                    try:
+                        evaluation = self._minimax(board, depth-1, alpha, beta, False)
+                    finally:
+                        self._undo(board, token)
                     if evaluation > maxEval:
                         maxEval = evaluation
                         best_move = move
                     if self.alpha_beta:
                         alpha = max(alpha, evaluation)
                         if beta <= alpha:
+                            self._record_cutoff(move, ply, depth, move_index)
                             break
                 if not best_move:
-                    return game_state.heuristic(), game_state
-                
-                return maxEval, best_move
+                    return self._heuristic(board)
+
+                self._store(key, depth, ply, maxEval, alpha_orig, beta_orig, best_move)
+                return maxEval
             else:
                 minEval = float('inf')
                 best_move = None
-                for move in game_state.get_all_moves(PieceSide.PLAYER):
-                    evaluation = self._minimax(move, depth-1, alpha, beta, True)[0]
+                for move_index, move in enumerate(self._iter_moves(board, PieceSide.PLAYER, ply, pv_move)):
+                    token = self._apply(board, move)
+                    try:
+                        evaluation = self._minimax(board, depth-1, alpha, beta, True)
+                    finally:
+                        self._undo(board, token)
                     if evaluation < minEval:
                         minEval = evaluation
                         best_move = move
                     if self.alpha_beta:
                         beta = min(beta, evaluation)
                         if beta <= alpha:
+                            self._record_cutoff(move, ply, depth, move_index)
                             break
                 if not best_move:
-                    return game_state.heuristic(), game_state
-                return minEval, best_move
+                    return self._heuristic(board)
+                self._store(key, depth, ply, minEval, alpha_orig, beta_orig, best_move)
+                return minEval
+        except SearchTimeout:
+            raise
         except Exception as e:
-            return game_state.heuristic(), game_state
-        
-    def _save_time(self, time:float):
-        if not hasattr(self, "time_log_folder"):
+            return board.heuristic()
+
+    def _minimax_horizon(self, board: Board, key:int, alpha:float, beta:float, max_player:bool,
+                         ply:int, pv_move:Move | None)->int|float:
+        """
+        depth 1 node: every child is a leaf, so they are all scored in one batch without being played.
+        Children in the tablebase get its score instead, as _minimax probes every leaf first.
+        Visits and cuts off the children like _minimax would, with the same result.
+        """
+        side = PieceSide.COMPUTER if max_player else PieceSide.PLAYER
+        moves = list(self._iter_moves(board, side, ply, pv_move))
+        if not moves:
+            return self._heuristic(board)
+        eval_start = time.perf_counter()
+        scores = get_batch_evaluator(board).evaluate_moves(board, moves, side) # type: ignore
+        if self.stats:
+            self.stats.eval_time += time.perf_counter() - eval_start
+        if self.tablebase:
+            self._probe_leaves(board, moves, scores, max_player)
+
+        alpha_orig, beta_orig = alpha, beta
+        best_score = float('-inf') if max_player else float('inf')
+        best_move = moves[0]
+        for move_index, (move, score) in enumerate(zip(moves, scores)):
+            self.nodes += 1
+            if self.nodes % CheckerMinimax.TIME_CHECK_INTERVAL == 0 and self._is_out_of_time():
+                raise SearchTimeout()
+            if max_player:
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+                alpha = max(alpha, score) if self.alpha_beta else alpha
+            else:
+                if score < best_score:
+                    best_score = score
+                    best_move = move
+                beta = min(beta, score) if self.alpha_beta else beta
+            if self.alpha_beta and beta <= alpha:
+                self._record_cutoff(move, ply, 1, move_index)
+                break
+
+        self._store(key, 1, ply, best_score, alpha_orig, beta_orig, best_move)
+        return best_score
+
+    def _probe_leaves(self, board: Board, moves: list[Move], scores: list[int], max_player:bool):
+        """
+        replaces the scores of the moves leading to a tablebase position by the tablebase score,
+        only the moves that leave few enough pieces are played
+        """
+        pieces = (board.player_bits | board.computer_bits).bit_count()
+        leaf_side = PieceSide.PLAYER if max_player else PieceSide.COMPUTER
+        for i, move in enumerate(moves):
+            if pieces - move.captured.bit_count() > self.tablebase.max_pieces: # type: ignore
+                continue
+            token = self._apply(board, move)
+            try:
+                score = self.tablebase.probe_score(board, leaf_side, self.root_depth) # type: ignore
+            finally:
+                self._undo(board, token)
+            if score is not None:
+                scores[i] = score
+
+    def _is_out_of_time(self)->bool:
+        return time.time() - self.start_time > self.time_limit or self.stop_event.is_set()
+
+    def _order_moves(self, moves: list[Move], ply:int, pv_move:Move | None)->list[Move]:
+        if self.move_ordering:
+            return self.move_ordering.order(moves, ply, pv_move)
+        return moves
+
+    def _iter_moves(self, board: Board, side: PieceSide, ply:int, pv_move:Move | None)->Iterator[Move]:
+        """
+        moves of a node, generated lazily so a cutoff skips generating the rest
+        """
+        moves = self.move_ordering.iter_moves(board, side, ply, pv_move) if self.move_ordering else board.iter_moves(side)
+        if self.stats:
+            return self.stats.timed_moves(moves)
+        return moves
+
+    def _record_cutoff(self, move: Move, ply:int, depth:int, move_index:int):
+        """
+        move_index: number of moves searched before the move at the node
+        """
+        if self.move_ordering:
+            self.move_ordering.record_cutoff(move, ply, depth)
+        if self.stats:
+            self.stats.record_cutoff(move_index)
+
+    def _store(self, key:int, depth:int, ply:int, score:int|float, alpha:float, beta:float, best_move:Move):
+        """
+        ply: plies from the root of the node, alpha, beta: search window the score was found with
+        """
+        if not self.transposition_table:
+            return
+        # the children may have searched with a root alpha raised since, a score below it is only an upper bound
+        alpha = max(alpha, self.root_alpha)
+        if score <= alpha:
+            bound = Bound.UPPER
+        elif score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.transposition_table.store(key, depth, self._to_tt_score(score, ply), bound, best_move)
+
+    def _to_tt_score(self, score:int|float, ply:int)->int|float:
+        """
+        tablebase scores count the plies to the end from the root, the table keeps them counted from the node
+        so an entry is right at any ply and in later searches
+        """
+        if score >= TABLEBASE_WIN_MIN:
+            return score + ply
+        if score <= -TABLEBASE_WIN_MIN:
+            return score - ply
+        return score
+
+    def _from_tt_score(self, score:int|float, ply:int)->int|float:
+        if score >= TABLEBASE_WIN_MIN:
+            return score - ply
+        if score <= -TABLEBASE_WIN_MIN:
+            return score + ply
+        return score
+
+    def _save_time(self, board: Board, seconds:float):
+        if not self.time_log_folder:
             return  
         
-        context = GameContext()
-        board_size = context.get_board_size()
+        board_size = board.total_rows
         alpha_beta = "alpha_beta" if self.alpha_beta else ""
         max_depth = self.max_depth
         log_file_name = f"minimax_time_log_{board_size}x{board_size}_depth-{max_depth}_{alpha_beta}.txt"
+        os.makedirs(self.time_log_folder, exist_ok=True)
         with open(os.path.join(self.time_log_folder, log_file_name), "a") as f:
-            f.write(f"{time}\n")
\ No newline at end of file
+            f.write(f"{seconds}\n")
+
+    def _save_telemetry(self, board: Board, source:str, seconds:float):
+        """
+        source: where the move came from, "search", "book" or "ponder".
+        With parallel workers only the nodes are known, the other counters of the workers are not collected.
+        """
+        if not self.telemetry_log or not self.stats:
+            return
+        stats = self.stats
+        in_process = self.parallel_search is None
+        cutoffs = sum(stats.cutoff_move_indexes)
+        tt_stats = self.get_tt_stats()
+        self.telemetry_log.write({
+            "timestamp": time.time(),
+            "board_size": board.total_rows,
+            "max_depth": self.max_depth,
+            "alpha_beta": self.alpha_beta,
+            "workers": self.parallel_search.workers if self.parallel_search else 1,
+            "source": source,
+            "seconds": seconds,
+            "nodes": self.nodes,
+            "nps": self.nodes / seconds if seconds > 0 else 0.0,
+            "depth": self.depth_reached,
+            "cutoffs": cutoffs if in_process else None,
+            "cutoff_move_indexes": stats.cutoff_move_indexes if in_process else None,
+            "first_move_cutoff_rate": (stats.cutoff_move_indexes[0] / cutoffs if cutoffs else None) if in_process else None,
+            "branching_factor": (self.nodes / stats.expanded if stats.expanded else None) if in_process else None,
+            "tt_hit_rate": tt_stats.get("hit_rate") if in_process and tt_stats else None,
+            "movegen_sec": stats.movegen_time if in_process else None,
+            "apply_sec": stats.apply_time if in_process else None,
+            "eval_sec": stats.eval_time if in_process else None,
+        })
@@ -0,0 +1,208 @@
+from core.board import Board
+from core.board_tables import get_board_tables
+from core.piece import PieceSide
+from itertools import combinations
+from math import comb
+import mmap
+import struct
+
+MAGIC = b"CKTB"
+VERSION = 1
+# magic, version, rows, cols, max pieces, slice count
+HEADER = struct.Struct("<4sHBBBH")
+# player men, player kings, computer men, computer kings, side to move (0 player, 1 computer), done, data offset, positions
+SLICE = struct.Struct("<BBBBBBQQ")
+SIDES = (PieceSide.PLAYER, PieceSide.COMPUTER)
+
+# above any heuristic() value, a win found sooner scores higher
+TABLEBASE_WIN_SCORE = 1000000
+# scores at least this far from 0 are tablebase wins or losses, their distance to the end depends on the ply
+TABLEBASE_WIN_MIN = TABLEBASE_WIN_SCORE // 2
+
+def get_signatures(max_pieces:int)->list[tuple[int, int, int, int]]:
+    """
+    every (player men, player kings, computer men, computer kings) with 2 to max_pieces pieces and
+    at least one piece per side, in generation order: a capture or promotion only leads to an earlier signature
+    """
+    signatures = []
+    for player in range(1, max_pieces):
+        for computer in range(1, max_pieces - player + 1):
+            for player_kings in range(player + 1):
+                for computer_kings in range(computer + 1):
+                    signatures.append((player - player_kings, player_kings, computer - computer_kings, computer_kings))
+    signatures.sort(key=lambda signature: (sum(signature), signature[0] + signature[2], signature))
+    return signatures
+
+class TablebaseIndexer:
+    """
+    Numbers the positions of one signature: each group of pieces (player men, player kings, computer men,
+    computer kings) is a combination of dark squares ranked in colex order, and the position index
+    is the mixed radix number of the four ranks. Overlapping groups and men on their promotion row
+    are not positions, their entries are never used.
+    """
+    def __init__(self, total_rows:int, total_cols:int, max_pieces:int):
+        tables = get_board_tables(total_rows, total_cols)
+        self.total_rows = total_rows
+        self.total_cols = total_cols
+        self.max_pieces = max_pieces
+        # dark square ordinal -> square index and back
+        self.squares = [index for index, coor in enumerate(tables.coors) if coor is not None]
+        self.ordinals = {index: ordinal for ordinal, index in enumerate(self.squares)}
+        self.square_count = len(self.squares)
+        # men are never on the row they promote on: the player's is the first row, the computer's the last
+        self.player_promotion_mask = sum(1 << index for index in self.squares if tables.coors[index][0] == 0)
+        self.computer_promotion_mask = tables.promotion_mask & ~self.player_promotion_mask
+        # combinations of every size in rank order, as bits
+        self.combination_bits:list[list[int]] = []
+        for k in range(max_pieces + 1):
+            ordered = sorted(combinations(range(self.square_count), k), key=lambda combination: combination[::-1])
+            self.combination_bits.append([sum(1 << self.squares[ordinal] for ordinal in combination)
+                                          for combination in ordered])
+
+    def get_slice_size(self, signature: tuple[int, int, int, int])->int:
+        size = 1
+        for count in signature:
+            size *= comb(self.square_count, count)
+        return size
+
+    def get_signature(self, board: Board)->tuple[int, int, int, int]:
+        kings = board.king_bits
+        return ((board.player_bits & ~kings).bit_count(), (board.player_bits & kings).bit_count(),
+                (board.computer_bits & ~kings).bit_count(), (board.computer_bits & kings).bit_count())
+
+    def get_index(self, board: Board, signature: tuple[int, int, int, int])->int:
+        kings = board.king_bits
+        index = 0
+        for bits, count in ((board.player_bits & ~kings, signature[0]), (board.player_bits & kings, signature[1]),
+                            (board.computer_bits & ~kings, signature[2]), (board.computer_bits & kings, signature[3])):
+            rank = 0
+            i = 1
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                rank += comb(self.ordinals[bit.bit_length() - 1], i)
+                i += 1
+            index = index * comb(self.square_count, count) + rank
+        return index
+
+    def get_position_bits(self, signature: tuple[int, int, int, int], index:int)->tuple[int, int, int] | None:
+        """
+        returns (player bits, computer bits, king bits) of the position index, or None when it is not a position
+        """
+        groups = []
+        for count in reversed(signature):
+            index, rank = divmod(index, comb(self.square_count, count))
+            groups.append(self.combination_bits[count][rank])
+        computer_kings, computer_men, player_kings, player_men = groups
+        player = player_men | player_kings
+        computer = computer_men | computer_kings
+        if player_men & self.player_promotion_mask or computer_men & self.computer_promotion_mask:
+            return None
+        if (player | computer).bit_count() != sum(signature):
+            return None
+        return player, computer, player_kings | computer_kings
+
+    def set_position(self, board: Board, bits: tuple[int, int, int], side: PieceSide):
+        """
+        puts the position on the board, only the bitboards, counts and side to move are set
+        """
+        board.player_bits, board.computer_bits, board.king_bits = bits
+        board.pieces_left = {PieceSide.PLAYER: bits[0].bit_count(), PieceSide.COMPUTER: bits[1].bit_count()}
+        board.kings = {PieceSide.PLAYER: (bits[0] & bits[2]).bit_count(), PieceSide.COMPUTER: (bits[1] & bits[2]).bit_count()}
+        board.side_to_move = side
+
+class TablebaseLayout:
+    """
+    Header and slice table of a tablebase file. One byte per position:
+    0 for a draw (or not a position), otherwise the number of plies to the end of the game plus one.
+    An odd number of plies is a win for the side to move, an even one a loss.
+    A side with no piece or no move left has lost.
+    """
+    def __init__(self, total_rows:int, total_cols:int, max_pieces:int):
+        self.total_rows = total_rows
+        self.total_cols = total_cols
+        self.max_pieces = max_pieces
+        self.indexer = TablebaseIndexer(total_rows, total_cols, max_pieces)
+        self.signatures = get_signatures(max_pieces)
+        # (signature, side) -> [slice number, data offset, positions, done]
+        self.slices:dict[tuple[tuple[int, int, int, int], PieceSide], list] = {}
+        offset = HEADER.size + SLICE.size * 2 * len(self.signatures)
+        for signature in self.signatures:
+            size = self.indexer.get_slice_size(signature)
+            for side in SIDES:
+                self.slices[(signature, side)] = [len(self.slices), offset, size, False]
+                offset += size
+        self.file_size = offset
+
+    def get_slice_entry_offset(self, slice_number:int)->int:
+        return HEADER.size + SLICE.size * slice_number
+
+    def pack_header(self)->bytes:
+        data = HEADER.pack(MAGIC, VERSION, self.total_rows, self.total_cols, self.max_pieces, len(self.slices))
+        for (signature, side), (_, offset, size, done) in self.slices.items():
+            data += SLICE.pack(*signature, SIDES.index(side), done, offset, size)
+        return data
+
+    @staticmethod
+    def read(data)->"TablebaseLayout":
+        magic, version, total_rows, total_cols, max_pieces, slice_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise Exception("Not a tablebase file of this version")
+        layout = TablebaseLayout(total_rows, total_cols, max_pieces)
+        for slice_number in range(slice_count):
+            *signature, side, done, offset, size = SLICE.unpack_from(data, layout.get_slice_entry_offset(slice_number))
+            entry = layout.slices[(tuple(signature), SIDES[side])]
+            if entry[1] != offset or entry[2] != size:
+                raise Exception("Tablebase slice table does not match its layout")
+            entry[3] = bool(done)
+        return layout
+
+class EndgameTablebase:
+    """
+    Read-only tablebase file mapped in memory, probed during the search.
+    Build one with: python -m tools.build_tablebase
+    """
+    def __init__(self, path:str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.layout = TablebaseLayout.read(self.data)
+        self.max_pieces = self.layout.max_pieces
+        self.hits = 0
+
+    def covers(self, board: Board)->bool:
+        return board.total_rows == self.layout.total_rows and board.total_cols == self.layout.total_cols and \
+            (board.player_bits | board.computer_bits).bit_count() <= self.max_pieces
+
+    def probe(self, board: Board, side: PieceSide)->int | None:
+        """
+        returns the stored byte of the position with the side to move, None when it is not in the tablebase
+        """
+        if not self.covers(board) or not board.player_bits or not board.computer_bits:
+            return None
+        indexer = self.layout.indexer
+        signature = indexer.get_signature(board)
+        entry = self.layout.slices.get((signature, side))
+        if entry is None or not entry[3]:
+            return None
+        self.hits += 1
+        return self.data[entry[1] + indexer.get_index(board, signature)]
+
+    def probe_score(self, board: Board, side: PieceSide, ply:int = 0)->int | None:
+        """
+        returns the score of the position for the computer, a win sooner (counted from ply) scoring higher,
+        or None when it is not in the tablebase
+        """
+        value = self.probe(board, side)
+        if value is None:
+            return None
+        if value == 0:
+            return 0
+        plies = value - 1
+        score = TABLEBASE_WIN_SCORE - ply - plies
+        side_wins = plies % 2 == 1
+        return score if side_wins == (side == PieceSide.COMPUTER) else -score
+
+    def close(self):
+        self.data.close()
+        self.file.close()
@@ -0,0 +1,84 @@
+from core.board import Board
+from core.move import Move
+from core.piece import PieceSide
+from typing import Iterator
+
+class MoveOrdering:
+    """
+    Orders the moves of a node so alpha-beta cuts off early:
+        1. the principal variation move (best move stored for the position)
+        2. captures, longest chain first
+        3. killer moves: quiet moves that caused a cutoff at the same ply
+        4. quiet moves by history score: how often and how deep a (from, to) move caused a cutoff
+    """
+    KILLERS_PER_PLY = 2
+
+    def __init__(self, max_ply:int):
+        self.killers:list[list[Move | None]] = [[None] * MoveOrdering.KILLERS_PER_PLY for _ in range(max_ply + 1)]
+        self.history:dict[tuple[int, int], int] = {}
+
+    def new_search(self):
+        for killers in self.killers:
+            for i in range(len(killers)):
+                killers[i] = None
+        # keep what earlier searches learned, but let the new one outweigh it
+        for move, score in self.history.items():
+            self.history[move] = score >> 1
+
+    def order(self, moves: list[Move], ply:int, pv_move:Move | None = None)->list[Move]:
+        """
+        returns the moves, best candidates first
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history
+        scored = []
+        for move in moves:
+            if move == pv_move:
+                priority = (3, 0, 0)
+            elif move.captured:
+                priority = (2, len(move.path), 0)
+            elif move in killers:
+                priority = (1, MoveOrdering.KILLERS_PER_PLY - killers.index(move), 0)
+            else:
+                priority = (0, 0, history.get((move.src, move.path[-1]), 0))
+            scored.append((priority, move))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def iter_moves(self, board: Board, side: PieceSide, ply:int, pv_move:Move | None = None)->Iterator[Move]:
+        """
+        yields the moves of the side in the order of order(), generating each group only when the previous one
+        is used up: a cutoff on the pv move or a capture never generates the quiet moves
+        """
+        if pv_move is not None and board.is_legal_move(pv_move, side):
+            yield pv_move
+        else:
+            pv_move = None
+
+        captures = [move for move in board.iter_moves(side, steps=False) if move != pv_move]
+        captures.sort(key=lambda move: len(move.path), reverse=True)
+        yield from captures
+
+        killers = [move for move in (self.killers[ply] if ply < len(self.killers) else [])
+                   if move is not None and move != pv_move and board.is_legal_move(move, side)]
+        yield from killers
+
+        history = self.history
+        quiets = [move for move in board.iter_moves(side, captures=False) if move != pv_move and move not in killers]
+        quiets.sort(key=lambda move: history.get((move.src, move.path[-1]), 0), reverse=True)
+        yield from quiets
+
+    def record_cutoff(self, move: Move, ply:int, depth:int):
+        """
+        move: move that caused a beta cutoff, captures are already searched first so only quiet moves are kept
+        """
+        if move.captured:
+            return
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+        history_key = (move.src, move.path[-1])
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
@@ -0,0 +1,91 @@
+from core.board import Board
+from core.move import Move
+from core.piece import PieceSide
+import mmap
+import struct
+
+MAGIC = b"CKOB"
+VERSION = 1
+# magic, version, rows, cols, entries
+HEADER = struct.Struct("<4sHBBI")
+# position hash, start square, end square, captured pieces, search depth of the move
+ENTRY = struct.Struct("<QHHBB")
+
+def pack_book(total_rows:int, total_cols:int, entries: list[tuple[int, Move, int]])->bytes:
+    """
+    entries: (position hash, move, search depth), a position may have several moves, best first
+    """
+    data = bytearray(HEADER.pack(MAGIC, VERSION, total_rows, total_cols, len(entries)))
+    # sorted by hash for the binary search, moves of a position keep their order
+    for key, move, depth in sorted(entries, key=lambda entry: entry[0]):
+        data += ENTRY.pack(key, move.src, move.path[-1], move.captured.bit_count(), depth)
+    return bytes(data)
+
+class OpeningBook:
+    """
+    Read-only opening book file mapped in memory: position hash -> book moves, sorted by hash.
+    Build one with: python -m tools.build_opening_book
+    """
+    def __init__(self, path:str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.total_rows, self.total_cols, self.entry_count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f"{path} is not an opening book of this version")
+        self.hits = 0
+
+    def _get_key(self, entry:int)->int:
+        return struct.unpack_from("<Q", self.data, HEADER.size + entry * ENTRY.size)[0]
+
+    def get_entries(self, key:int)->list[tuple[int, int, int, int]]:
+        """
+        returns (start square, end square, captured pieces, depth) of every book move of the position hash
+        """
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        while low < self.entry_count and self._get_key(low) == key:
+            entries.append(ENTRY.unpack_from(self.data, HEADER.size + low * ENTRY.size)[1:])
+            low += 1
+        return entries
+
+    def find_move(self, board: Board, side: PieceSide = PieceSide.COMPUTER)->Move | None:
+        """
+        returns the first book move of the position that is legal on the board, None when the position is not in the book
+        """
+        if board.total_rows != self.total_rows or board.total_cols != self.total_cols:
+            return None
+        entries = self.get_entries(board.hash())
+        for src, dst, captured, _ in entries:
+            move = self._decode_move(board, side, src, dst, captured)
+            if move is not None:
+                self.hits += 1
+                return move
+        return None
+
+    def _decode_move(self, board: Board, side: PieceSide, src:int, dst:int, captured:int)->Move | None:
+        """
+        returns the legal move of the side matching a book entry, without generating the other moves:
+        a step is checked directly, a capture chain is found among the moves of the piece on src
+        """
+        if not captured:
+            move = Move(src, (dst,))
+            return move if board.is_legal_move(move, side) else None
+        own = board.player_bits if side == PieceSide.PLAYER else board.computer_bits
+        if not own & (1 << src):
+            return None
+        row, col = board.get_index_coor(src)
+        move = board.get_valid_moves(row, col).get(board.get_index_coor(dst))
+        if move is not None and move.captured.bit_count() == captured:
+            return move
+        return None
+
+    def close(self):
+        self.data.close()
+        self.file.close()
@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.board import Board
+from core.move import Move
+import multiprocessing
+import logging
+
+logger = logging.getLogger(__name__)
+
+# state of a worker process, set up once by _init_worker
+_worker_minimax = None
+_worker_alpha = None
+_worker_alpha_beta = True
+# id of the search the worker's transposition table and move ordering were last prepared for
+_worker_search_id = -1
+
+def _init_worker(shared_alpha, stop_event, alpha_beta:bool, tt_size_mb:int, batch_leaf_eval:bool,
+                 tablebase_path:str | None):
+    global _worker_minimax, _worker_alpha, _worker_alpha_beta
+    from .checker_minimax import CheckerMinimax
+    _worker_minimax = CheckerMinimax(0, 0, alpha_beta, tt_size_mb, batch_leaf_eval=batch_leaf_eval,
+                                     tablebase_path=tablebase_path)
+    # the parent's stop() ends the worker searches too
+    _worker_minimax.stop_event = stop_event
+    if alpha_beta:
+        # re-read during the search, so a root move finishing elsewhere narrows the running ones
+        _worker_minimax.shared_alpha = shared_alpha
+    _worker_alpha = shared_alpha
+    _worker_alpha_beta = alpha_beta
+
+def _search_root_move(board: Board, move: Move, move_index:int, depth:int, deadline:float,
+                      search_id:int)->tuple[int, int|float|None, int]:
+    """
+    move_index: position of the move in the root move list, returned with the result
+    search_id: id of the search the move belongs to, the first task of a new search ages the worker's tables
+    returns (move index, score or None when the deadline was reached or the search was stopped, searched nodes)
+    """
+    global _worker_search_id
+    from .checker_minimax import SearchTimeout
+    minimax = _worker_minimax
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        minimax.new_search()
+    alpha = _worker_alpha.value if _worker_alpha_beta else float('-inf')
+    try:
+        score = minimax.search_root_move(board, move, depth, alpha, deadline)
+    except SearchTimeout:
+        return move_index, None, minimax.nodes
+
+    if _worker_alpha_beta:
+        with _worker_alpha.get_lock():
+            if score > _worker_alpha.value:
+                _worker_alpha.value = score
+    return move_index, score, minimax.nodes
+
+class RootParallelSearch:
+    """
+    Splits the root moves of one iteration across worker processes.
+    The first (principal) move is searched alone, so the others start with its score as alpha;
+    every finished root move raises the alpha shared by all workers, which the running root move searches
+    read again every CheckerMinimax.TIME_CHECK_INTERVAL nodes to narrow their windows.
+    Each worker keeps its own transposition table and move ordering between searches and ages them,
+    as the single process search does, when it gets the first root move of a new search.
+    stop_event is shared with the workers, setting it ends every running root move search.
+    """
+    def __init__(self, workers:int, alpha_beta:bool, tt_size_mb:int, batch_leaf_eval:bool = False,
+                 tablebase_path:str | None = None):
+        # spawn: the search thread runs next to pygame, forking it is not safe
+        context = multiprocessing.get_context("spawn")
+        self.shared_alpha = context.Value('d', float('-inf'))
+        self.stop_event = context.Event()
+        self.workers = workers
+        self.search_id = 0
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                            initializer=_init_worker,
+                                            initargs=(self.shared_alpha, self.stop_event, alpha_beta, tt_size_mb,
+                                                      batch_leaf_eval, tablebase_path))
+
+    def new_search(self):
+        """
+        called once per search before its first iteration
+        """
+        self.search_id += 1
+
+    def search_root(self, board: Board, root_moves: list[Move], depth:int, deadline:float)->tuple[list[int|float|None], int]:
+        """
+        root_moves: root moves in search order
+        returns the score of every root move (None when it was not finished) and the searched nodes
+        """
+        scores:list[int|float|None] = [None] * len(root_moves)
+
+        with self.shared_alpha.get_lock():
+            self.shared_alpha.value = float('-inf')
+
+        _, score, nodes = self.executor.submit(_search_root_move, board, root_moves[0], 0, depth, deadline,
+                                            self.search_id).result()
+        scores[0] = score
+        if score is None:
+            return scores, nodes
+
+        futures = [self.executor.submit(_search_root_move, board, move, i, depth, deadline, self.search_id)
+                   for i, move in enumerate(root_moves) if i > 0]
+        for future in as_completed(futures):
+            move_index, score, move_nodes = future.result()
+            scores[move_index] = score
+            nodes += move_nodes
+
+        return scores, nodes
+
+    def close(self):
+        """
+        stops the running searches and waits for the workers to exit: a worker still starting up
+        would otherwise find the shared alpha and stop event already released
+        """
+        self.stop_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,118 @@
+from core.board import Board
+from core.move import Move
+from typing import Iterator
+import csv
+import json
+import os
+import time
+
+TELEMETRY_FORMATS = ("jsonl", "csv")
+# fields of a telemetry record, in csv column order
+FIELDS = ("timestamp", "board_size", "max_depth", "alpha_beta", "workers", "source", "seconds", "nodes", "nps",
+          "depth", "cutoffs", "cutoff_move_indexes", "first_move_cutoff_rate", "branching_factor", "tt_hit_rate",
+          "movegen_sec", "apply_sec", "eval_sec")
+
+class SearchStats:
+    """
+    Counters of one search for the telemetry log, only collected while telemetry is on:
+        expanded: nodes whose moves were searched, nodes / expanded is the average branching factor
+        cutoff_move_indexes: beta cutoffs per index of the move that caused them, 0 for the first move searched
+        movegen_time, apply_time, eval_time: seconds spent generating and ordering moves,
+        playing and undoing them, and scoring leaves
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.expanded = 0
+        self.cutoff_move_indexes:list[int] = []
+        self.movegen_time = 0.0
+        self.apply_time = 0.0
+        self.eval_time = 0.0
+
+    def record_cutoff(self, move_index:int):
+        while len(self.cutoff_move_indexes) <= move_index:
+            self.cutoff_move_indexes.append(0)
+        self.cutoff_move_indexes[move_index] += 1
+
+    def timed_moves(self, moves: Iterator[Move])->Iterator[Move]:
+        while True:
+            start = time.perf_counter()
+            move = next(moves, None)
+            self.movegen_time += time.perf_counter() - start
+            if move is None:
+                return
+            yield move
+
+    def timed_apply(self, board: Board, move: Move)->tuple:
+        start = time.perf_counter()
+        token = board.apply(move)
+        self.apply_time += time.perf_counter() - start
+        return token
+
+    def timed_undo(self, board: Board, token: tuple):
+        start = time.perf_counter()
+        board.undo(token)
+        self.apply_time += time.perf_counter() - start
+
+    def timed_heuristic(self, board: Board)->int:
+        start = time.perf_counter()
+        score = board.heuristic()
+        self.eval_time += time.perf_counter() - start
+        return score
+
+class TelemetryLog:
+    """
+    Appends one record per computer move to minimax_telemetry_<size>x<size>.<format> in the log folder.
+    Read them back with read_records, or summarize a folder with: python -m tools.telemetry_report
+    """
+    def __init__(self, folder:str, format:str = "jsonl"):
+        if format not in TELEMETRY_FORMATS:
+            raise Exception(f"Unknown telemetry format {format}, expected one of {TELEMETRY_FORMATS}")
+        self.folder = folder
+        self.format = format
+
+    def write(self, record: dict):
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, f"minimax_telemetry_{record['board_size']}x{record['board_size']}.{self.format}")
+        if self.format == "jsonl":
+            with open(path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+            return
+        new_file = not os.path.exists(path)
+        with open(path, "a", newline="") as file:
+            writer = csv.DictWriter(file, FIELDS)
+            if new_file:
+                writer.writeheader()
+            row = dict(record)
+            row["cutoff_move_indexes"] = ";".join(str(count) for count in record["cutoff_move_indexes"] or [])
+            writer.writerow(row)
+
+def read_records(folder:str)->list[dict]:
+    """
+    every record of the telemetry files of the folder, csv values converted back to numbers
+    """
+    records = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if not name.startswith("minimax_telemetry_"):
+            continue
+        if name.endswith(".jsonl"):
+            with open(path) as file:
+                records.extend(json.loads(line) for line in file if line.strip())
+        elif name.endswith(".csv"):
+            with open(path, newline="") as file:
+                for row in csv.DictReader(file):
+                    record:dict = {}
+                    for field, value in row.items():
+                        if field == "cutoff_move_indexes":
+                            record[field] = [int(count) for count in value.split(";")] if value else []
+                        elif value == "":
+                            record[field] = None
+                        else:
+                            try:
+                                record[field] = float(value) if "." in value or "e" in value else int(value)
+                            except ValueError:
+                                record[field] = value
+                    records.append(record)
+    return records
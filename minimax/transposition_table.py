@@ -0,0 +1,83 @@
+from enum import Enum
+from typing import Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Bound(Enum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+class TranspositionTable:
+    """
+    Fixed-size table keyed by the board zobrist hash.
+    Every bucket has two slots: the first keeps the deepest result (entries from an older
+    search are replaced regardless of depth), the second is always replaced.
+    An entry is a tuple (key, depth, score, bound, best_move, generation).
+    """
+    # rough cost of one stored entry: the tuple, its 64-bit key and the slot pointer
+    ENTRY_SIZE_BYTES = 200
+    BUCKET_SLOTS = 2
+
+    def __init__(self, size_mb:int):
+        entries = max(size_mb * 1024 * 1024 // TranspositionTable.ENTRY_SIZE_BYTES, TranspositionTable.BUCKET_SLOTS)
+        self.bucket_count = entries // TranspositionTable.BUCKET_SLOTS
+        self.slots:list[tuple | None] = [None] * (self.bucket_count * TranspositionTable.BUCKET_SLOTS)
+        self.generation = 0
+        self.reset_stats()
+        logger.debug(f"Transposition table: {self.bucket_count} buckets for {size_mb} MB")
+
+    def new_search(self):
+        """
+        marks the entries stored so far as old, so deeper results from earlier searches can be replaced
+        """
+        self.generation += 1
+
+    def probe(self, key:int)->tuple | None:
+        index = (key % self.bucket_count) * 2
+        slots = self.slots
+        deep = slots[index]
+        if deep is not None and deep[0] == key:
+            self.hits += 1
+            return deep
+        recent = slots[index + 1]
+        if recent is not None and recent[0] == key:
+            self.hits += 1
+            return recent
+
+        self.misses += 1
+        if deep is not None or recent is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key:int, depth:int, score:int|float, bound:Bound, best_move:Any):
+        index = (key % self.bucket_count) * 2
+        slots = self.slots
+        entry = (key, depth, score, bound, best_move, self.generation)
+        deep = slots[index]
+        self.stores += 1
+        if deep is None or deep[0] == key or deep[5] != self.generation or depth >= deep[1]:
+            slots[index] = entry
+        else:
+            slots[index + 1] = entry
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.generation = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def get_stats(self)->dict[str, int | float]:
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
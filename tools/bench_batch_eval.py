@@ -0,0 +1,142 @@
+"""
+positions per second of the scalar evaluation and of the numpy batch evaluation, which must give the same scores:
+    dataset: scoring stored positions from scratch, Board.compute_eval() one by one vs BatchEvaluator.evaluate()
+    horizon: scoring the children of a position, apply + heuristic() + undo per move vs BatchEvaluator.evaluate_moves()
+    search: nodes per second of CheckerMinimax with and without batch_leaf_eval, with the same best move and node count
+    tablebase: the same search comparison on endgame positions with the tablebase of the size loaded,
+        when one was built at tablebase/endgame_<size>x<size>.bin
+usage: python -m tools.bench_batch_eval [board size...]
+"""
+from tools.headless import init_headless_context
+from tools.bench_move_ordering import make_test_positions
+from core.board import Board
+from core.piece import PieceSide
+from core.batch_evaluation import get_batch_evaluator
+import random
+import sys
+import time
+import os
+
+DATASET_GAMES = 40
+SEARCH_DEPTH = 6
+TABLEBASE_POSITIONS = 20
+# endgame positions have at most this many pieces more than the tablebase, so the search reaches it
+TABLEBASE_EXTRA_PIECES = 2
+
+def make_dataset(board_size:int)->list[Board]:
+    """
+    every position of random games
+    """
+    rng = random.Random(board_size)
+    positions = []
+    for _ in range(DATASET_GAMES):
+        board = Board(board_size, board_size)
+        side = PieceSide.PLAYER
+        while board.winner() == None:
+            moves = board.get_moves(side)
+            if not moves:
+                break
+            board.apply(rng.choice(moves))
+            positions.append(board.copy())
+            side = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+    return positions
+
+def make_endgame_positions(board_size:int, max_pieces:int)->list[Board]:
+    """
+    positions of random games with the computer to move and at most max_pieces pieces
+    """
+    positions = []
+    for board in make_dataset(board_size):
+        if board.side_to_move == PieceSide.COMPUTER and board.winner() == None and \
+           (board.player_bits | board.computer_bits).bit_count() <= max_pieces and \
+           len(board.get_moves(PieceSide.COMPUTER)) > 1:
+            positions.append(board)
+    return positions[::max(1, len(positions) // TABLEBASE_POSITIONS)][:TABLEBASE_POSITIONS]
+
+def compare_search(board: Board, **options)->list[tuple]:
+    """
+    returns (best move, nodes, nodes per second) of the search without and with batch_leaf_eval
+    """
+    from minimax.checker_minimax import CheckerMinimax
+    results = []
+    for batch_leaf_eval in (False, True):
+        minimax = CheckerMinimax(SEARCH_DEPTH, 10**6, True, 16, batch_leaf_eval=batch_leaf_eval, **options)
+        start = time.perf_counter()
+        best_move, _ = minimax.find_best_checker_move(board)
+        results.append((best_move, minimax.nodes, minimax.nodes / (time.perf_counter() - start)))
+        minimax.close()
+    return results
+
+def positions_per_sec(function, positions:int)->float:
+    start = time.perf_counter()
+    function()
+    return positions / (time.perf_counter() - start)
+
+def scalar_children(board: Board, moves: list, side: PieceSide)->list[int]:
+    scores = []
+    for move in moves:
+        token = board.apply(move)
+        scores.append(board.heuristic())
+        board.undo(token)
+    return scores
+
+def main():
+    init_headless_context()
+    from minimax.endgame_tablebase import EndgameTablebase
+    sizes = [int(arg) for arg in sys.argv[1:]] or [8, 10, 12]
+
+    print(f"{'size':>6} {'positions':>10} {'dataset scalar/s':>17} {'dataset batch/s':>16} "
+          f"{'horizon scalar/s':>17} {'horizon batch/s':>16}")
+    for board_size in sizes:
+        dataset = make_dataset(board_size)
+        evaluator = get_batch_evaluator(dataset[0])
+        if evaluator is None:
+            print("numpy not found")
+            return
+        if evaluator.evaluate(dataset).tolist() != [board.compute_eval() for board in dataset]:
+            raise Exception(f"Batch dataset scores differ on {board_size}x{board_size}")
+        dataset_scalar = positions_per_sec(lambda: [board.compute_eval() for board in dataset], len(dataset))
+        dataset_batch = positions_per_sec(lambda: evaluator.evaluate(dataset), len(dataset))
+
+        children = []
+        for board in dataset:
+            side = board.side_to_move
+            moves = board.get_moves(side)
+            if moves:
+                children.append((board, moves, side))
+                if evaluator.evaluate_moves(board, moves, side) != scalar_children(board, moves, side):
+                    raise Exception(f"Batch move scores differ on {board_size}x{board_size}")
+        child_count = sum(len(moves) for _, moves, _ in children)
+        horizon_scalar = positions_per_sec(lambda: [scalar_children(*item) for item in children], child_count)
+        horizon_batch = positions_per_sec(lambda: [evaluator.evaluate_moves(*item) for item in children], child_count)
+
+        print(f"{board_size:>6} {len(dataset):>10} {dataset_scalar:>17.0f} {dataset_batch:>16.0f} "
+              f"{horizon_scalar:>17.0f} {horizon_batch:>16.0f}")
+
+    print()
+    print(f"{'size':>6} {'position':>8} {'nodes':>8} {'scalar nodes/s':>15} {'batch nodes/s':>14}")
+    for board_size in sizes:
+        for i, board in enumerate(make_test_positions(board_size, 3)):
+            results = compare_search(board)
+            if results[0][:2] != results[1][:2]:
+                raise Exception(f"Batch search differs on {board_size}x{board_size} position {i}")
+            print(f"{board_size:>6} {i:>8} {results[0][1]:>8} {results[0][2]:>15.0f} {results[1][2]:>14.0f}")
+
+    print()
+    print(f"{'size':>6} {'endgame':>8} {'nodes':>8} {'scalar nodes/s':>15} {'batch nodes/s':>14}")
+    for board_size in sizes:
+        tablebase_path = os.path.join("tablebase", f"endgame_{board_size}x{board_size}.bin")
+        if not os.path.exists(tablebase_path):
+            print(f"{board_size:>6} no tablebase at {tablebase_path}, build one with: python -m tools.build_tablebase")
+            continue
+        tablebase = EndgameTablebase(tablebase_path)
+        max_pieces = tablebase.max_pieces
+        tablebase.close()
+        for i, board in enumerate(make_endgame_positions(board_size, max_pieces + TABLEBASE_EXTRA_PIECES)):
+            results = compare_search(board, tablebase_path=tablebase_path)
+            if results[0][:2] != results[1][:2]:
+                raise Exception(f"Batch search with the tablebase differs on {board_size}x{board_size} endgame {i}")
+            print(f"{board_size:>6} {i:>8} {results[0][1]:>8} {results[0][2]:>15.0f} {results[1][2]:>14.0f}")
+
+if __name__ == "__main__":
+    main()
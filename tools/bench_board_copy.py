@@ -0,0 +1,65 @@
+"""
+measures memory and time per board copy: the old layout (a grid of mutable per-square piece
+objects, deep-copied) against the bitboard Board with shared Piece flyweights
+usage: python -m tools.bench_board_copy
+"""
+from core.board import Board
+from core.piece import PieceSide
+from copy import deepcopy
+import timeit
+import tracemalloc
+
+BOARD_SIZES = [8, 16]
+COPIES = 1000
+
+class _GridPiece:
+    """
+    piece object of the old board layout: one mutable instance per square
+    """
+    def __init__(self, row:int, col:int, side:PieceSide, king:bool):
+        self.row = row
+        self.col = col
+        self.side = side
+        self.king = king
+
+class _GridBoard:
+    def __init__(self, board: Board):
+        self.board = [[None if piece is None else _GridPiece(row, col, piece.side, piece.king)
+                       for col, piece in enumerate(board[row])] for row in range(board.get_size())]
+        self.pieces_left = dict(board.pieces_left)
+        self.kings = dict(board.kings)
+        self.total_rows = board.total_rows
+        self.total_cols = board.total_cols
+
+def measure(copy_func)->tuple[float, float]:
+    """
+    returns (bytes allocated per copy, microseconds per copy)
+    """
+    tracemalloc.start()
+    copies = [copy_func() for _ in range(COPIES)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copies
+
+    seconds = timeit.timeit(copy_func, number=COPIES)
+    return allocated / COPIES, seconds / COPIES * 1e6
+
+def main():
+    print(f"{'size':>6} {'layout':>22} {'bytes/copy':>11} {'us/copy':>9}")
+    for board_size in BOARD_SIZES:
+        board = Board(board_size, board_size)
+        grid_board = _GridBoard(board)
+        results = [
+            ("grid deepcopy", measure(lambda: deepcopy(grid_board))),
+            ("bitboard deepcopy", measure(lambda: deepcopy(board))),
+            ("bitboard Board.copy", measure(board.copy)),
+        ]
+        for name, (size, micros) in results:
+            print(f"{board_size:>3}x{board_size:<2} {name:>22} {size:>11.0f} {micros:>9.2f}")
+
+        grid_size, grid_micros = results[0][1]
+        copy_size, copy_micros = results[2][1]
+        print(f"{'':>6} {'saved per copy':>22} {grid_size - copy_size:>11.0f} {grid_micros - copy_micros:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+per-leaf cost of the evaluation: the material-only count used before the piece-square tables,
+the piece-square tables summed over the whole board, and the incrementally kept score that heuristic() returns.
+Also times apply + undo, which pays for the incremental update.
+usage: python -m tools.bench_eval [board size...]
+"""
+from tools.bench_move_ordering import make_test_positions
+from core.board import Board
+from core.piece import PieceSide
+import sys
+import timeit
+
+POSITIONS = 20
+REPEAT = 2000
+
+def material(board: Board)->int:
+    return board.pieces_left[PieceSide.COMPUTER] - board.pieces_left[PieceSide.PLAYER] + \
+        (board.kings[PieceSide.COMPUTER] - board.kings[PieceSide.PLAYER])
+
+def apply_undo(board: Board, moves: list):
+    for move in moves:
+        board.undo(board.apply(move))
+
+def per_call_ns(function, boards: list[Board], calls_per_board:int = 1)->float:
+    seconds = timeit.timeit(lambda: [function(board) for board in boards], number=REPEAT)
+    return seconds / (REPEAT * len(boards) * calls_per_board) * 1e9
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [8, 10, 12]
+    print(f"{'size':>6} {'material ns':>12} {'full scan ns':>13} {'incremental ns':>15} {'apply+undo ns':>14}")
+    for board_size in sizes:
+        boards = make_test_positions(board_size, POSITIONS)
+        moves = {id(board): board.get_moves(PieceSide.COMPUTER) for board in boards}
+        move_count = sum(len(board_moves) for board_moves in moves.values()) / len(boards)
+        print(f"{board_size:>6} {per_call_ns(material, boards):>12.0f} "
+              f"{per_call_ns(Board.compute_eval, boards):>13.0f} "
+              f"{per_call_ns(Board.heuristic, boards):>15.0f} "
+              f"{per_call_ns(lambda board: apply_undo(board, moves[id(board)]), boards, move_count):>14.0f}")
+
+if __name__ == "__main__":
+    main()
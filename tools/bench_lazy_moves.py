@@ -0,0 +1,67 @@
+"""
+counts the moves allocated per search with every node generating its full move list (eager)
+and with the moves generated lazily, group by group (lazy).
+Node counts can differ slightly: lazily generated quiet moves are sorted by the history scores
+of the time they are reached.
+usage: python -m tools.bench_lazy_moves [depth 8x8] [depth 10x10]
+"""
+from tools.headless import init_headless_context
+from tools.bench_move_ordering import make_test_positions, POSITIONS_PER_SIZE
+from core.board import Board
+from core.move import Move
+from core.piece import PieceSide
+import core.board
+import sys
+import time
+
+class CountingMove(Move):
+    __slots__ = ()
+    created = 0
+
+    def __init__(self, src:int, path:tuple[int, ...], captured:int = 0):
+        CountingMove.created += 1
+        super().__init__(src, path, captured)
+
+def search_moves(board: Board, depth:int, lazy:bool)->tuple[int, int, float]:
+    """
+    returns (searched nodes, allocated moves, seconds)
+    """
+    from minimax.checker_minimax import CheckerMinimax
+
+    class EagerMinimax(CheckerMinimax):
+        def _iter_moves(self, board: Board, side: PieceSide, ply:int, pv_move:Move | None):
+            return iter(self._order_moves(board.get_moves(side), ply, pv_move))
+
+    minimax_class = CheckerMinimax if lazy else EagerMinimax
+    minimax = minimax_class(depth, 10**6, True, 16)
+    CountingMove.created = 0
+    start = time.perf_counter()
+    minimax.find_best_checker_move(board)
+    return minimax.nodes, CountingMove.created, time.perf_counter() - start
+
+def main():
+    init_headless_context()
+    core.board.Move = CountingMove
+    depths = {8: int(sys.argv[1]) if len(sys.argv) > 1 else 6,
+              10: int(sys.argv[2]) if len(sys.argv) > 2 else 5}
+
+    for board_size, depth in depths.items():
+        print(f"{board_size}x{board_size} depth {depth}")
+        print(f"{'position':>8} {'nodes eager':>12} {'nodes lazy':>11} {'moves eager':>12} {'moves lazy':>11} "
+              f"{'per node eager':>15} {'per node lazy':>14} {'sec eager':>10} {'sec lazy':>9}")
+        totals = [0, 0, 0, 0]
+        for i, board in enumerate(make_test_positions(board_size, POSITIONS_PER_SIZE)):
+            nodes_eager, moves_eager, sec_eager = search_moves(board, depth, False)
+            nodes_lazy, moves_lazy, sec_lazy = search_moves(board, depth, True)
+            totals[0] += nodes_eager
+            totals[1] += nodes_lazy
+            totals[2] += moves_eager
+            totals[3] += moves_lazy
+            print(f"{i:>8} {nodes_eager:>12} {nodes_lazy:>11} {moves_eager:>12} {moves_lazy:>11} "
+                  f"{moves_eager / nodes_eager:>15.2f} {moves_lazy / nodes_lazy:>14.2f} {sec_eager:>10.2f} {sec_lazy:>9.2f}")
+        print(f"{'total':>8} {totals[0]:>12} {totals[1]:>11} {totals[2]:>12} {totals[3]:>11} "
+              f"{totals[2] / totals[0]:>15.2f} {totals[3] / totals[1]:>14.2f}")
+        print()
+
+if __name__ == "__main__":
+    main()
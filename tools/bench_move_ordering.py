@@ -0,0 +1,60 @@
+"""
+counts searched nodes with and without move ordering on fixed test positions
+usage: python -m tools.bench_move_ordering [depth 8x8] [depth 10x10]
+"""
+from tools.headless import init_headless_context
+from core.board import Board
+from core.piece import PieceSide
+import random
+import sys
+import time
+
+POSITIONS_PER_SIZE = 6
+
+def make_test_positions(board_size:int, count:int, seed:int = 1)->list[Board]:
+    """
+    deterministic positions with the computer to move, reached by random play from the opening
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(board_size, board_size)
+        side = PieceSide.PLAYER
+        for _ in range(2 * rng.randrange(2, 16) - 1):
+            moves = board.get_moves(side)
+            if not moves or board.winner() != None:
+                break
+            board.apply(rng.choice(moves))
+            side = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+        if side == PieceSide.COMPUTER and board.winner() == None and len(board.get_moves(side)) > 1:
+            positions.append(board)
+    return positions
+
+def search_nodes(board: Board, depth:int, move_ordering:bool)->tuple[int, float]:
+    from minimax.checker_minimax import CheckerMinimax
+    minimax = CheckerMinimax(depth, 10**6, True, 16, move_ordering=move_ordering)
+    start = time.perf_counter()
+    minimax.find_best_checker_move(board)
+    return minimax.nodes, time.perf_counter() - start
+
+def main():
+    init_headless_context()
+    depths = {8: int(sys.argv[1]) if len(sys.argv) > 1 else 6,
+              10: int(sys.argv[2]) if len(sys.argv) > 2 else 5}
+
+    for board_size, depth in depths.items():
+        print(f"{board_size}x{board_size} depth {depth}")
+        print(f"{'position':>8} {'nodes off':>10} {'nodes on':>10} {'ebf off':>8} {'ebf on':>8} {'sec off':>8} {'sec on':>8}")
+        totals = [0, 0]
+        for i, board in enumerate(make_test_positions(board_size, POSITIONS_PER_SIZE)):
+            nodes_off, sec_off = search_nodes(board, depth, False)
+            nodes_on, sec_on = search_nodes(board, depth, True)
+            totals[0] += nodes_off
+            totals[1] += nodes_on
+            print(f"{i:>8} {nodes_off:>10} {nodes_on:>10} {nodes_off ** (1 / depth):>8.2f} {nodes_on ** (1 / depth):>8.2f} {sec_off:>8.2f} {sec_on:>8.2f}")
+        print(f"{'total':>8} {totals[0]:>10} {totals[1]:>10} "
+              f"{(totals[0] / POSITIONS_PER_SIZE) ** (1 / depth):>8.2f} {(totals[1] / POSITIONS_PER_SIZE) ** (1 / depth):>8.2f}")
+        print()
+
+if __name__ == "__main__":
+    main()
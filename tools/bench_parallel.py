@@ -0,0 +1,47 @@
+"""
+compares the root-parallel search with the single-threaded search on fixed positions
+usage: python -m tools.bench_parallel [depth] [board size]
+"""
+from tools.headless import init_headless_context
+from tools.bench_move_ordering import make_test_positions
+from core.board import Board
+import sys
+import time
+
+WORKER_COUNTS = [1, 2, 4, 8]
+POSITION_COUNT = 4
+
+def time_search(positions: list[Board], depth:int, workers:int)->tuple[float, int]:
+    from minimax.checker_minimax import CheckerMinimax
+    minimax = CheckerMinimax(depth, 10**6, True, 16, workers=workers)
+    try:
+        # start the worker processes before timing
+        minimax.find_best_checker_move(positions[0])
+        total_sec = 0.0
+        total_nodes = 0
+        for board in positions:
+            start = time.perf_counter()
+            minimax.find_best_checker_move(board)
+            total_sec += time.perf_counter() - start
+            total_nodes += minimax.nodes
+        return total_sec, total_nodes
+    finally:
+        minimax.close()
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    board_size = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    init_headless_context()
+    positions = make_test_positions(board_size, POSITION_COUNT)
+
+    print(f"{board_size}x{board_size} depth {depth}, {POSITION_COUNT} positions")
+    print(f"{'workers':>8} {'sec':>8} {'nodes':>10} {'nodes/s':>10} {'speedup':>8}")
+    serial_sec = None
+    for workers in WORKER_COUNTS:
+        sec, nodes = time_search(positions, depth, workers)
+        if serial_sec is None:
+            serial_sec = sec
+        print(f"{workers:>8} {sec:>8.2f} {nodes:>10} {nodes / sec:>10.0f} {serial_sec / sec:>8.2f}")
+
+if __name__ == "__main__":
+    main()
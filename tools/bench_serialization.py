@@ -0,0 +1,82 @@
+"""
+round trip check and speed of the Board formats: pickle, the text and binary formats of core.board_serialization,
+and a binary batch read in place from shared memory by worker processes
+usage: python -m tools.bench_serialization [board size...]
+"""
+from tools.bench_batch_eval import make_dataset
+from core.board import Board
+from core.board_serialization import (board_to_text, board_from_text, board_to_bytes, board_from_bytes,
+                                      pack_positions, get_batch_size, PositionBatch)
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import pickle
+import sys
+import time
+
+WORKERS = 2
+
+def same_position(a: Board, b: Board)->bool:
+    return (a.total_rows, a.total_cols, a.player_bits, a.computer_bits, a.king_bits, a.side_to_move, a.hash(),
+            a.heuristic(), a.pieces_left, a.kings) == \
+           (b.total_rows, b.total_cols, b.player_bits, b.computer_bits, b.king_bits, b.side_to_move, b.hash(),
+            b.heuristic(), b.pieces_left, b.kings)
+
+def _sum_scores(name:str, start:int, stop:int)->int:
+    """
+    worker: reads its share of the batch straight from the shared memory block
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    batch = PositionBatch(memory.buf)
+    total = sum(batch[i].heuristic() for i in range(start, stop))
+    batch.release()
+    memory.close()
+    return total
+
+def read_all(batch: PositionBatch)->list[Board]:
+    return [batch[i] for i in range(len(batch))]
+
+def per_sec(function, count:int)->float:
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [8, 10, 12]
+    print(f"{'size':>5} {'positions':>9} {'pickle B':>8} {'text B':>7} {'binary B':>8} {'pickle/s':>9} "
+          f"{'text/s':>8} {'binary/s':>9} {'batch/s':>8}")
+    for board_size in sizes:
+        boards = make_dataset(board_size)
+        for board in boards:
+            if not same_position(pickle.loads(pickle.dumps(board)), board) or \
+               not same_position(board_from_text(board_to_text(board)), board) or \
+               not same_position(board_from_bytes(board_to_bytes(board)), board):
+                raise Exception(f"Round trip differs: {board_to_text(board)}")
+        batch = PositionBatch(bytes(pack_positions(boards)))
+        if not all(same_position(batch[i], board) for i, board in enumerate(boards)):
+            raise Exception(f"Batch round trip differs on {board_size}x{board_size}")
+
+        count = len(boards)
+        pickle_rate = per_sec(lambda: [pickle.loads(pickle.dumps(board)) for board in boards], count)
+        text_rate = per_sec(lambda: [board_from_text(board_to_text(board)) for board in boards], count)
+        binary_rate = per_sec(lambda: [board_from_bytes(board_to_bytes(board)) for board in boards], count)
+        batch_rate = per_sec(lambda: read_all(PositionBatch(pack_positions(boards))), count)
+        print(f"{board_size:>5} {count:>9} {len(pickle.dumps(boards[0])):>8} {len(board_to_text(boards[0])):>7} "
+              f"{len(board_to_bytes(boards[0])):>8} {pickle_rate:>9.0f} {text_rate:>8.0f} {binary_rate:>9.0f} "
+              f"{batch_rate:>8.0f}")
+
+        memory = shared_memory.SharedMemory(create=True, size=get_batch_size(board_size, board_size, count))
+        try:
+            pack_positions(boards, memory.buf)
+            step = (count + WORKERS - 1) // WORKERS
+            with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+                totals = executor.map(_sum_scores, [memory.name] * WORKERS, range(0, count, step),
+                                      [min(start + step, count) for start in range(0, count, step)])
+                if sum(totals) != sum(board.heuristic() for board in boards):
+                    raise Exception(f"Shared memory batch differs on {board_size}x{board_size}")
+        finally:
+            memory.close()
+            memory.unlink()
+    print("Round trips and shared memory batches match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+builds the opening book of one board size: every position the computer can face in the first plies of a game
+(any player move, the book move for the computer) is searched deeply and its best move is stored.
+Every position is then looked up in the written book, which logs the slowest lookup.
+usage: python -m tools.build_opening_book [plies] [depth] [seconds per position] [board size] [workers] [output file]
+"""
+from tools.headless import init_headless_context
+from core.board import Board
+from core.move import Move
+from core.piece import PieceSide
+from minimax.opening_book import pack_book, OpeningBook
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# each lookup is timed this many times and the best kept, so the slowest lookup is not a scheduler pause
+LOOKUP_REPEATS = 20
+
+def _init_worker():
+    init_headless_context()
+
+def _search_position(board: Board, depth:int, seconds:int)->tuple[Move, int]:
+    """
+    returns the best move of the computer and the depth of the deepest finished iteration
+    """
+    from minimax.checker_minimax import CheckerMinimax
+    minimax = CheckerMinimax(depth, seconds, True, 64)
+    best_move, _ = minimax.find_best_checker_move(board)
+    return best_move, minimax.depth_reached
+
+def build(path:str, plies:int, depth:int, seconds:int, board_size:int, workers:int):
+    start_time = time.time()
+    start = Board(board_size, board_size)
+    # positions with the computer to move, reached by every player move from the previous level
+    level = {}
+    for move in start.get_moves(PieceSide.PLAYER):
+        board = start.get_state_from_move(move)
+        level[board.hash()] = board
+
+    entries: list[tuple[int, Move, int]] = []
+    book_boards: list[Board] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for ply in range(1, plies + 1, 2):
+            boards = list(level.values())
+            results = executor.map(_search_position, boards, [depth] * len(boards), [seconds] * len(boards))
+            next_level = {}
+            for board, (best_move, depth_reached) in zip(boards, results):
+                entries.append((board.hash(), best_move, depth_reached))
+                book_boards.append(board)
+                if ply + 2 > plies:
+                    continue
+                reply = board.get_state_from_move(best_move)
+                for move in reply.get_moves(PieceSide.PLAYER):
+                    next_board = reply.get_state_from_move(move)
+                    if next_board.winner() == None and next_board.get_moves(PieceSide.COMPUTER):
+                        next_level[next_board.hash()] = next_board
+            logger.info(f"Ply {ply}: {len(boards)} positions, {time.time() - start_time:.0f}s")
+            level = next_level
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(pack_book(board_size, board_size, entries))
+    logger.info(f"{len(entries)} positions written to {path}")
+    check_lookups(path, book_boards, [move for _, move, _ in entries])
+
+def check_lookups(path:str, boards: list[Board], moves: list[Move]):
+    """
+    looks up every book position, fails when the book move is not found
+    """
+    book = OpeningBook(path)
+    slowest = 0.0
+    for board, move in zip(boards, moves):
+        best_time = float('inf')
+        for _ in range(LOOKUP_REPEATS):
+            start = time.perf_counter()
+            book_move = book.find_move(board)
+            best_time = min(best_time, time.perf_counter() - start)
+        if book_move != move:
+            raise Exception(f"Book move {move} not found, got {book_move}")
+        slowest = max(slowest, best_time)
+    book.close()
+    logger.info(f"Slowest lookup: {slowest * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seconds = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    board_size = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else (os.cpu_count() or 1)
+    path = sys.argv[6] if len(sys.argv) > 6 else os.path.join("book", f"opening_{board_size}x{board_size}.bin")
+    build(path, plies, depth, seconds, board_size, workers)
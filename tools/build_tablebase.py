@@ -0,0 +1,216 @@
+"""
+builds the endgame tablebase of one board size by retrograde analysis, for every position with up to max pieces.
+Signatures are solved one after the other, smaller ones first: the moves of every position are generated
+by worker processes, the parent solves the slice (both sides to move) and writes it to the file.
+An interrupted build continues after the last finished signature when run again with the same arguments.
+usage: python -m tools.build_tablebase [max pieces] [board size] [workers] [output file]
+"""
+from core.board import Board
+from core.piece import PieceSide
+from minimax.endgame_tablebase import TablebaseLayout, SIDES
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+import logging
+import mmap
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+CHUNK_POSITIONS = 8192
+MAX_PLIES = 254
+
+# state of a worker process, set up once by _init_worker
+_worker_layout: TablebaseLayout | None = None
+_worker_data: mmap.mmap | None = None
+_worker_board: Board | None = None
+
+def _init_worker(path:str):
+    global _worker_layout, _worker_data, _worker_board
+    file = open(path, "rb")
+    _worker_data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker_layout = TablebaseLayout.read(_worker_data)
+    _worker_board = Board(_worker_layout.total_rows, _worker_layout.total_cols)
+
+def _build_edges(signature: tuple[int, int, int, int], start:int, stop:int)->tuple[array, array, array, array, array]:
+    """
+    positions start to stop of the signature, the player to move ones numbered first, then the computer to move ones
+    returns per position:
+        number of moves staying in the signature (-1 when the index is not a position), those moves' positions,
+        fewest plies of a lost position reached by leaving the signature (-1 for none),
+        most plies of a won position reached by leaving the signature (-1 for none),
+        1 when leaving the signature can reach a draw
+    """
+    layout, data, board = _worker_layout, _worker_data, _worker_board
+    indexer = layout.indexer # type: ignore
+    size = layout.slices[(signature, PieceSide.PLAYER)][2] # type: ignore
+    counts, successors = array("i"), array("q")
+    ext_loss, ext_win, ext_draw = array("h"), array("h"), array("b")
+
+    for position in range(start, stop):
+        side = SIDES[position // size]
+        bits = indexer.get_position_bits(signature, position % size)
+        if bits is None:
+            counts.append(-1)
+            ext_loss.append(-1)
+            ext_win.append(-1)
+            ext_draw.append(0)
+            continue
+
+        indexer.set_position(board, bits, side) # type: ignore
+        opp = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+        opp_offset = size if opp == PieceSide.COMPUTER else 0
+        count, loss, win, draw = 0, -1, -1, 0
+        for move in board.iter_moves(side): # type: ignore
+            token = board.apply(move) # type: ignore
+            if not (board.computer_bits if opp == PieceSide.COMPUTER else board.player_bits): # type: ignore
+                loss = 0
+            else:
+                next_signature = indexer.get_signature(board)
+                index = indexer.get_index(board, next_signature)
+                if next_signature == signature:
+                    successors.append(opp_offset + index)
+                    count += 1
+                else:
+                    value = data[layout.slices[(next_signature, opp)][1] + index] # type: ignore
+                    plies = value - 1
+                    if value == 0:
+                        draw = 1
+                    elif plies % 2 == 1:
+                        win = max(win, plies)
+                    elif loss < 0 or plies < loss:
+                        loss = plies
+            board.undo(token) # type: ignore
+        counts.append(count)
+        ext_loss.append(loss)
+        ext_win.append(win)
+        ext_draw.append(draw)
+
+    return counts, successors, ext_loss, ext_win, ext_draw
+
+def solve_slice(total:int, counts: array, successors: array, ext_loss: array, ext_win: array, ext_draw: array)->bytearray:
+    """
+    decides positions in order of plies to the end, like a shortest path search:
+    a position wins in d + 1 plies once a successor is lost in d, and loses in 1 + the most plies
+    of its successors once all of them are won. Whatever is left undecided is a draw.
+    """
+    predecessor_start = array("q", bytes(8 * (total + 1)))
+    for successor in successors:
+        predecessor_start[successor + 1] += 1
+    for position in range(total):
+        predecessor_start[position + 1] += predecessor_start[position]
+    predecessors = array("q", bytes(8 * len(successors)))
+    filled = array("q", predecessor_start[:-1])
+    edge = 0
+    for position in range(total):
+        for _ in range(max(counts[position], 0)):
+            successor = successors[edge]
+            predecessors[filled[successor]] = position
+            filled[successor] += 1
+            edge += 1
+
+    remaining = array("i", counts)
+    max_win = array("h", ext_win)
+    plies = array("h", [-1]) * total
+    # buckets[d]: (position, is win) candidates decided in d plies
+    buckets:list[list[tuple[int, bool]]] = [[] for _ in range(MAX_PLIES + 2)]
+    for position in range(total):
+        if counts[position] < 0:
+            continue
+        if ext_loss[position] >= 0:
+            buckets[ext_loss[position] + 1].append((position, True))
+        elif counts[position] == 0 and not ext_draw[position]:
+            buckets[ext_win[position] + 1].append((position, False))
+
+    for d in range(MAX_PLIES + 1):
+        for position, is_win in buckets[d]:
+            if plies[position] >= 0:
+                continue
+            plies[position] = d
+            for i in range(predecessor_start[position], predecessor_start[position + 1]):
+                predecessor = predecessors[i]
+                if plies[predecessor] >= 0:
+                    continue
+                if not is_win:
+                    buckets[d + 1].append((predecessor, True))
+                    continue
+                remaining[predecessor] -= 1
+                if d > max_win[predecessor]:
+                    max_win[predecessor] = d
+                if remaining[predecessor] == 0 and not ext_draw[predecessor] and ext_loss[predecessor] < 0:
+                    buckets[max_win[predecessor] + 1].append((predecessor, False))
+    if buckets[MAX_PLIES + 1]:
+        raise Exception(f"Position longer than {MAX_PLIES} plies, it does not fit the tablebase format")
+
+    return bytearray(value + 1 if value >= 0 else 0 for value in plies)
+
+def open_tablebase(path:str, max_pieces:int, board_size:int)->TablebaseLayout:
+    """
+    returns the layout of the file, created empty when it does not exist yet
+    """
+    if os.path.exists(path):
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            layout = TablebaseLayout.read(data)
+        if (layout.total_rows, layout.total_cols, layout.max_pieces) != (board_size, board_size, max_pieces):
+            raise Exception(f"{path} holds another tablebase, remove it or choose another file")
+        return layout
+
+    layout = TablebaseLayout(board_size, board_size, max_pieces)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(layout.pack_header())
+        file.truncate(layout.file_size)
+    return layout
+
+def build(path:str, max_pieces:int, board_size:int, workers:int):
+    layout = open_tablebase(path, max_pieces, board_size)
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,))
+    try:
+        _build_slices(path, layout, executor)
+    except KeyboardInterrupt:
+        logger.info("Interrupted, run again with the same arguments to continue")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _build_slices(path:str, layout: TablebaseLayout, executor: ProcessPoolExecutor):
+    with open(path, "r+b") as file:
+        data = mmap.mmap(file.fileno(), 0)
+        for signature in layout.signatures:
+            slices = [layout.slices[(signature, side)] for side in SIDES]
+            if all(done for *_, done in slices):
+                continue
+
+            start_time = time.time()
+            size = slices[0][2]
+            total = 2 * size
+            futures = [executor.submit(_build_edges, signature, start, min(start + CHUNK_POSITIONS, total))
+                       for start in range(0, total, CHUNK_POSITIONS)]
+            counts, successors = array("i"), array("q")
+            ext_loss, ext_win, ext_draw = array("h"), array("h"), array("b")
+            for future in futures:
+                for result, part in zip((counts, successors, ext_loss, ext_win, ext_draw), future.result()):
+                    result.extend(part)
+
+            values = solve_slice(total, counts, successors, ext_loss, ext_win, ext_draw)
+            for side_number, (slice_number, offset, size, _) in enumerate(slices):
+                data[offset:offset + size] = values[side_number * size:(side_number + 1) * size]
+            data.flush()
+            # marked done only once the values are on disk, so an interrupted slice is built again
+            for slice_entry in slices:
+                slice_entry[3] = True
+            header = layout.pack_header()
+            data[:len(header)] = header
+            data.flush()
+
+            decided = sum(1 for value in values if value)
+            logger.info(f"{signature}: {total} entries, {decided} decided, {time.time() - start_time:.1f}s")
+        data.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    max_pieces = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    board_size = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    path = sys.argv[4] if len(sys.argv) > 4 else os.path.join("tablebase", f"endgame_{board_size}x{board_size}.bin")
+    build(path, max_pieces, board_size, workers)
@@ -0,0 +1,52 @@
+"""
+checks that pondering stopped in the middle of a reply's search is not lost: the search of that reply
+after the player's move must resume from the depth pondering reached and finish within the time left
+usage: python -m tools.check_ponder [seconds per move] [seconds pondered] [board size]
+"""
+from tools.headless import init_headless_context
+from core.board import Board
+from core.piece import PieceSide
+import threading
+import sys
+import time
+
+def main():
+    init_headless_context()
+    from minimax.checker_minimax import CheckerMinimax
+    time_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    ponder_sec = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    board_size = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    board = Board(board_size, board_size)
+    minimax = CheckerMinimax(0, time_limit, True, 64)
+    thread = threading.Thread(target=minimax.ponder, args=(board.copy(),))
+    thread.start()
+    time.sleep(ponder_sec)
+    minimax.stop()
+    thread.join()
+    if len(minimax.ponder_results) != 1:
+        raise Exception(f"Expected the stopped reply in the pondering results, got {len(minimax.ponder_results)}")
+    pondered_depth = next(iter(minimax.ponder_results.values()))[1]
+
+    # the player makes the reply that was being pondered
+    reply_board = next(board.get_state_from_move(move) for move in board.get_moves(PieceSide.PLAYER)
+                       if board.get_state_from_move(move).hash() in minimax.ponder_results)
+    start = time.time()
+    minimax.find_best_checker_move(reply_board)
+    pondered_sec = time.time() - start
+    print(f"Pondered {ponder_sec}s to depth {pondered_depth}, "
+          f"then searched {pondered_sec:.2f}s to depth {minimax.depth_reached}")
+
+    fresh = CheckerMinimax(0, time_limit, True, 64)
+    start = time.time()
+    fresh.find_best_checker_move(reply_board)
+    print(f"Without pondering: searched {time.time() - start:.2f}s to depth {fresh.depth_reached}")
+
+    if minimax.depth_reached < pondered_depth:
+        raise Exception("The search after pondering did not resume from the pondered depth")
+    if pondered_sec > time_limit - ponder_sec / 2:
+        raise Exception("The search after pondering did not use the time already pondered")
+    print("Pondering resumed")
+
+if __name__ == "__main__":
+    main()
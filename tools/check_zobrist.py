@@ -0,0 +1,74 @@
+"""
+plays random games and checks the incrementally updated Board.hash(), Board.heuristic() and piece counts
+against a from-scratch recompute
+usage: python -m tools.check_zobrist [games] [board size]
+"""
+from core.board import Board
+from core.piece import PieceSide
+import random
+import sys
+
+MAX_PLIES = 200
+
+def incremental_state_matches(board: Board)->bool:
+    for side in (PieceSide.PLAYER, PieceSide.COMPUTER):
+        bits = board.player_bits if side == PieceSide.PLAYER else board.computer_bits
+        if board.get_piece_count(side) != bits.bit_count() or \
+                board.get_king_count(side) != (bits & board.king_bits).bit_count() or \
+                len(board.get_pieces_by_side(side)) != bits.bit_count():
+            return False
+    return board.heuristic() == board.compute_eval()
+
+def check_game(board_size:int, seed:int):
+    rng = random.Random(seed)
+    board = Board(board_size, board_size)
+    side = PieceSide.PLAYER
+    for ply in range(MAX_PLIES):
+        if board.hash() != board.compute_hash():
+            raise Exception(f"Hash mismatch at ply {ply} of game {seed}")
+        if not incremental_state_matches(board):
+            raise Exception(f"Piece counts or evaluation out of date at ply {ply} of game {seed}")
+
+        moves = board.get_moves(side)
+        if not moves or board.winner() != None:
+            return
+
+        # every move has to be undone back to the same hash
+        before = board.hash()
+        for move in moves:
+            token = board.apply(move)
+            if board.hash() != board.compute_hash():
+                raise Exception(f"Hash mismatch after apply at ply {ply} of game {seed}")
+            if not incremental_state_matches(board):
+                raise Exception(f"Piece counts or evaluation out of date after apply at ply {ply} of game {seed}")
+            board.undo(token)
+            if board.hash() != before:
+                raise Exception(f"Hash not restored by undo at ply {ply} of game {seed}")
+
+        # alternate between apply() and the move()/remove() path
+        move = rng.choice(moves)
+        if ply % 2 == 0:
+            board.apply(move)
+        else:
+            coors = board.get_move_coors(move)
+            captured = []
+            bits = move.captured
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                captured.append(board.get_square_coor(bit))
+            board.remove(captured)
+            board.move(*coors[0], *coors[-1])
+            if board.hash() != board.compute_hash():
+                raise Exception(f"Hash mismatch after move/remove at ply {ply} of game {seed}")
+            if not incremental_state_matches(board):
+                raise Exception(f"Piece counts or evaluation out of date after move/remove at ply {ply} of game {seed}")
+        side = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    sizes = [int(sys.argv[2])] if len(sys.argv) > 2 else [8, 10, 12]
+    for board_size in sizes:
+        for seed in range(games):
+            check_game(board_size, seed)
+        print(f"{board_size}x{board_size}: {games} games ok")
@@ -0,0 +1,28 @@
+from core.evaluation import configure_eval_weights
+import configparser
+import os
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_config(path:str = os.path.join(ROOT_PATH, "game_config.ini"))->dict:
+    """
+    reads game_config.ini into the section -> {key: value} dict GameContext is initialized with, without pygame
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    return {s:dict(config.items(s)) for s in config.sections()}
+
+def init_headless_context():
+    """
+    initializes GameContext from game_config.ini with an offscreen window, for tools that use the game classes.
+    The minimax time log is turned off.
+    """
+    from game.game_context import GameContext
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    config_dict = load_config()
+    config_dict["LOG"] = {}
+
+    context = GameContext()
+    context.initialize(ROOT_PATH, config_dict)
+    configure_eval_weights(config_dict)
+    return context
@@ -0,0 +1,121 @@
+"""
+perft: counts the leaf positions at increasing depths from the opening and from stored positions on 8x8, 10x10
+and 12x12, checks the counts against known-good values and reports the nodes per second of move generation.
+Captures are not mandatory in this game, so the counts differ from the published draughts perft tables.
+Fails when a count is wrong or the throughput drops below the stored baseline by more than the tolerance.
+The baseline is a throughput of one machine, so it is kept locally (ignored by git) and the throughput
+is not checked until one was saved.
+usage: python -m tools.perft [check | save-baseline] [tolerance] [baseline file] [--require-baseline]
+    check (default): counts, and throughput against the baseline when there is one
+    save-baseline: measures the throughput on this machine and stores it as the baseline
+    --require-baseline: fails when there is no baseline instead of checking only the counts
+"""
+from core.board import Board
+from core.board_serialization import board_from_text, TEXT_PREFIX
+from core.piece import PieceSide
+import json
+import os
+import sys
+import time
+
+# local to the machine it was measured on, not committed
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perft_baseline.json")
+# throughput may drop this much below the baseline before the check fails
+DEFAULT_TOLERANCE = 0.2
+REPEATS = 3
+
+# (name, board size, position or None for the opening, expected leaf counts at depth 1, 2, 3...)
+# positions are the squares and side fields of the text format of core.board_serialization
+# Opening counts agree with the board-scanning move generator this repository started with.
+PERFT_POSITIONS:list[tuple[str, int, str | None, list[int]]] = [
+    ("opening", 8, None, [7, 49, 379, 2872, 23582, 190647]),
+    ("kings", 8, "..../p..p/..../...c/..../.pp./C.pp/.... c", [6, 52, 230, 1930, 7894, 65453]),
+    ("jump chains", 8, ".ccc/c.cc/.c.c/.cp./...c/.pp./p.pp/pppp c", [10, 101, 979, 9436, 88852]),
+    ("opening", 10, None, [9, 81, 793, 7654, 79010]),
+    ("kings", 10, "c.c.c/cccc./...cc/....c/...../cc.p./p..../ppp../ppp.p/....C p", [8, 101, 905, 12276, 118482]),
+    ("jump chains", 10, "ccccc/c.c.c/c.cc./.p.pc/....c/c..p./....p/p..pp/p.ppp/.pppp c", [16, 193, 2946, 37370]),
+    ("opening", 12, None, [11, 121, 1431, 16748, 207750]),
+    ("kings", 12, "cccc.c/.ccc../.ccPc./.c..c./c.c.../cp...c/..c.../.p.pp./p..p../pppppp/p.pp.p/pppp.p p",
+     [24, 429, 9840, 180672]),
+    ("jump chains", 12, "cccccc/cccccc/cccccc/c.cccc/c.pccc/....../c.pp.p/...p../pppppp/pppppp/pppppp/pppppp c",
+     [16, 219, 3212, 44347]),
+]
+
+def parse_position(text:str, board_size:int)->Board:
+    """
+    board of a position written as in PERFT_POSITIONS, the squares and side fields of the text position format
+    """
+    return board_from_text(f"{TEXT_PREFIX} {board_size}x{board_size} {text}")
+
+def perft(board: Board, side: PieceSide, depth:int)->int:
+    """
+    leaf positions depth plies ahead, a side with no move ends its line early and counts nothing.
+    The last ply is counted without playing the moves (bulk counting).
+    """
+    opp = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+    if depth == 1:
+        return sum(1 for _ in board.iter_moves(side))
+    nodes = 0
+    for move in board.iter_moves(side):
+        token = board.apply(move)
+        nodes += perft(board, opp, depth - 1)
+        board.undo(token)
+    return nodes
+
+def run()->tuple[list[str], float]:
+    """
+    returns the wrong counts and the leaves per second over every position, the best of REPEATS runs
+    """
+    errors = []
+    total_nodes = 0
+    total_time = 0.0
+    print(f"{'position':<16} {'size':>4} {'depth':>5} {'leaves':>12} {'leaves/s':>10}")
+    for name, board_size, position, expected in PERFT_POSITIONS:
+        board = parse_position(position, board_size) if position else Board(board_size, board_size)
+        for depth, expected_nodes in enumerate(expected, 1):
+            best_time = float('inf')
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                nodes = perft(board, board.side_to_move, depth)
+                best_time = min(best_time, time.perf_counter() - start)
+            if nodes != expected_nodes:
+                errors.append(f"{name} depth {depth}: {nodes} leaves, expected {expected_nodes}")
+            total_nodes += nodes
+            total_time += best_time
+            print(f"{name:<16} {board_size:>4} {depth:>5} {nodes:>12} {nodes / best_time:>10.0f}")
+    return errors, total_nodes / total_time
+
+def main():
+    require_baseline = "--require-baseline" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--require-baseline"]
+    mode = args[0] if len(args) > 0 else "check"
+    tolerance = float(args[1]) if len(args) > 1 else DEFAULT_TOLERANCE
+    baseline_path = args[2] if len(args) > 2 else BASELINE_PATH
+
+    errors, nps = run()
+    print(f"Total: {nps:.0f} leaves/s")
+    for error in errors:
+        print(f"Wrong count: {error}")
+    if errors:
+        sys.exit(1)
+
+    if mode == "save-baseline":
+        with open(baseline_path, "w") as file:
+            json.dump({"leaves_per_sec": round(nps)}, file, indent=1)
+        print(f"Baseline saved to {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, throughput not checked, only the counts. "
+              f"Store one with: python -m tools.perft save-baseline")
+        if require_baseline:
+            sys.exit(1)
+        return
+    with open(baseline_path) as file:
+        baseline = json.load(file)["leaves_per_sec"]
+    print(f"Baseline: {baseline} leaves/s, {nps / baseline - 1:+.1%}")
+    if nps < baseline * (1 - tolerance):
+        print(f"Throughput is more than {tolerance:.0%} below the baseline")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+headless engine-vs-engine games, no pygame or GameContext needed. Every setting (board size, depth, alpha-beta)
+plays its games with the same engine settings on both sides, each game in its own process and opened with a
+few random plies so the games differ. Reports the game results, the time per move distribution and the node rates.
+The opening book and endgame tablebase are not used, so every move is searched.
+usage: python -m tools.self_play [board sizes] [depths] [alpha-beta settings] [games per setting]
+                                 [seconds per move] [processes] [report file]
+    lists are comma separated, e.g. python -m tools.self_play 8,10 4,6 True,False 4 2 4 report.json
+"""
+from tools.headless import load_config
+from tools.telemetry_report import percentile
+from core.board import Board
+from core.board_tables import get_board_tables
+from core.evaluation import configure_eval_weights
+from core.move import Move
+from core.piece import PieceSide
+from minimax.checker_minimax import CheckerMinimax
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import random
+import sys
+import time
+
+OPENING_PLIES = 2
+# a game still going after this many plies is a draw
+MAX_PLIES = 200
+
+def _init_worker(config:dict):
+    configure_eval_weights(config)
+
+def _get_mirror_squares(board: Board)->list[int]:
+    """
+    square index -> index of the square rotated by 180 degrees, -1 for ghost bits
+    """
+    tables = get_board_tables(board.total_rows, board.total_cols)
+    index_of = {coor: index for index, coor in enumerate(tables.coors) if coor is not None}
+    return [index_of[(board.total_rows - 1 - coor[0], board.total_cols - 1 - coor[1])] if coor is not None else -1
+            for coor in tables.coors]
+
+def _mirror_bits(bits:int, mirror:list[int])->int:
+    ret = 0
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+        ret |= 1 << mirror[bit.bit_length() - 1]
+    return ret
+
+def mirror_board(board: Board, mirror:list[int])->Board:
+    """
+    the board seen from the other side: rotated by 180 degrees with the sides swapped,
+    so CheckerMinimax, which always plays the computer, can play the player's pieces
+    """
+    mirrored = Board(board.total_rows, board.total_cols, board.eval_weights)
+    mirrored.set_position(_mirror_bits(board.computer_bits, mirror), _mirror_bits(board.player_bits, mirror),
+                          _mirror_bits(board.king_bits, mirror),
+                          PieceSide.COMPUTER if board.side_to_move == PieceSide.PLAYER else PieceSide.PLAYER)
+    return mirrored
+
+def mirror_move(move: Move, mirror:list[int])->Move:
+    return Move(mirror[move.src], tuple(mirror[square] for square in move.path), _mirror_bits(move.captured, mirror))
+
+def play_game(board_size:int, depth:int, alpha_beta:bool, seconds:int, tt_size_mb:int, seed:int)->dict:
+    """
+    returns the winner ("player", "computer" or "draw"), the plies played and (seconds, nodes, depth reached)
+    of every searched move
+    """
+    rng = random.Random(seed)
+    board = Board(board_size, board_size)
+    mirror = _get_mirror_squares(board)
+    # engines[side] plays side, the player's engine sees the mirrored board
+    engines = {side: CheckerMinimax(depth, seconds, alpha_beta, tt_size_mb) for side in (PieceSide.PLAYER, PieceSide.COMPUTER)}
+    side = PieceSide.PLAYER
+    moves:list[tuple[float, int, int]] = []
+    plies = 0
+    winner = "draw"
+    while plies < MAX_PLIES:
+        legal_moves = board.get_moves(side)
+        if board.winner() != None or not legal_moves:
+            winner = "computer" if side == PieceSide.PLAYER else "player"
+            break
+        if plies < OPENING_PLIES:
+            move = rng.choice(legal_moves)
+        else:
+            engine = engines[side]
+            start = time.perf_counter()
+            if side == PieceSide.COMPUTER:
+                move, _ = engine.find_best_checker_move(board)
+            else:
+                mirrored_move, _ = engine.find_best_checker_move(mirror_board(board, mirror))
+                move = mirror_move(mirrored_move, mirror)
+            moves.append((time.perf_counter() - start, engine.nodes, engine.depth_reached))
+        board.apply(move)
+        side = PieceSide.COMPUTER if side == PieceSide.PLAYER else PieceSide.PLAYER
+        plies += 1
+
+    for engine in engines.values():
+        engine.close()
+    return {"board_size": board_size, "depth": depth, "alpha_beta": alpha_beta, "seed": seed,
+            "winner": winner, "plies": plies, "moves": moves}
+
+def summarize(games:list[dict])->list[dict]:
+    """
+    one summary per setting: results, time per move percentiles and node rates
+    """
+    settings:dict[tuple[int, int, bool], list[dict]] = {}
+    for game in games:
+        settings.setdefault((game["board_size"], game["depth"], game["alpha_beta"]), []).append(game)
+
+    summaries = []
+    for (board_size, depth, alpha_beta), setting_games in sorted(settings.items()):
+        moves = [move for game in setting_games for move in game["moves"]]
+        times = sorted(seconds for seconds, _, _ in moves)
+        rates = sorted(nodes / seconds for seconds, nodes, _ in moves if seconds > 0)
+        total_time = sum(times)
+        summaries.append({
+            "board_size": board_size, "depth": depth, "alpha_beta": alpha_beta, "games": len(setting_games),
+            "player_wins": sum(1 for game in setting_games if game["winner"] == "player"),
+            "computer_wins": sum(1 for game in setting_games if game["winner"] == "computer"),
+            "draws": sum(1 for game in setting_games if game["winner"] == "draw"),
+            "moves": len(moves),
+            "move_sec_p50": percentile(times, 50) if times else 0.0,
+            "move_sec_p90": percentile(times, 90) if times else 0.0,
+            "move_sec_p99": percentile(times, 99) if times else 0.0,
+            "move_sec_max": times[-1] if times else 0.0,
+            "nps": sum(nodes for _, nodes, _ in moves) / total_time if total_time > 0 else 0.0,
+            "nps_p10": percentile(rates, 10) if rates else 0.0,
+            "mean_depth": sum(depth_reached for _, _, depth_reached in moves) / len(moves) if moves else 0.0,
+        })
+    return summaries
+
+def main():
+    board_sizes = [int(value) for value in sys.argv[1].split(",")] if len(sys.argv) > 1 else [8, 10]
+    depths = [int(value) for value in sys.argv[2].split(",")] if len(sys.argv) > 2 else [4]
+    alpha_betas = [value == "True" for value in sys.argv[3].split(",")] if len(sys.argv) > 3 else [True]
+    games = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+    seconds = int(sys.argv[5]) if len(sys.argv) > 5 else 5
+    processes = int(sys.argv[6]) if len(sys.argv) > 6 else (os.cpu_count() or 1)
+    report_path = sys.argv[7] if len(sys.argv) > 7 else None
+
+    config = load_config()
+    configure_eval_weights(config)
+    tt_size_mb = int(config["GAME"].get("computer-tt-size-mb", 64))
+    jobs = [(board_size, depth, alpha_beta, seconds, tt_size_mb, seed)
+            for board_size in board_sizes for depth in depths for alpha_beta in alpha_betas for seed in range(games)]
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(config,)) as executor:
+        results = list(executor.map(play_game, *zip(*jobs)))
+    summaries = summarize(results)
+
+    print(f"{len(results)} games in {time.time() - start:.1f}s")
+    print(f"{'size':>5} {'depth':>5} {'ab':>5} {'games':>5} {'P/C/D':>9} {'moves':>6} {'p50 s':>8} {'p90 s':>8} "
+          f"{'p99 s':>8} {'max s':>8} {'nodes/s':>9} {'p10 n/s':>9} {'depth':>6}")
+    for summary in summaries:
+        results_text = f"{summary['player_wins']}/{summary['computer_wins']}/{summary['draws']}"
+        print(f"{summary['board_size']:>5} {summary['depth']:>5} {str(summary['alpha_beta']):>5} {summary['games']:>5} "
+              f"{results_text:>9} {summary['moves']:>6} {summary['move_sec_p50']:>8.3f} {summary['move_sec_p90']:>8.3f} "
+              f"{summary['move_sec_p99']:>8.3f} {summary['move_sec_max']:>8.3f} {summary['nps']:>9.0f} "
+              f"{summary['nps_p10']:>9.0f} {summary['mean_depth']:>6.1f}")
+
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump({"settings": summaries, "games": results}, file, indent=1)
+        print(f"Report written to {report_path}")
+
+if __name__ == "__main__":
+    main()
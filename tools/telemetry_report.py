@@ -0,0 +1,46 @@
+"""
+percentiles of the search telemetry records of a log folder, per board size and depth reached.
+Turn the records on with minimax-telemetry=jsonl (or csv) in the [LOG] section of game_config.ini
+usage: python -m tools.telemetry_report [log folder]
+"""
+from minimax.search_telemetry import read_records
+import math
+import sys
+
+PERCENTILES = (50, 90, 99)
+COLUMNS = ("seconds", "nodes", "nps", "branching_factor", "first_move_cutoff_rate", "tt_hit_rate",
+           "movegen_sec", "apply_sec", "eval_sec")
+
+def percentile(values:list[float], p:int)->float:
+    """
+    nearest rank percentile of sorted values
+    """
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else "log"
+    records = read_records(folder)
+    if not records:
+        print(f"No telemetry records in {folder}")
+        return
+
+    sources:dict[str, int] = {}
+    groups:dict[tuple[int, int], list[dict]] = {}
+    for record in records:
+        sources[record["source"]] = sources.get(record["source"], 0) + 1
+        if record["source"] == "search":
+            groups.setdefault((record["board_size"], record["depth"]), []).append(record)
+    print(f"{len(records)} moves: " + ", ".join(f"{count} {source}" for source, count in sorted(sources.items())))
+
+    header = f"{'size':>5} {'depth':>5} {'moves':>6} {'':>4}" + "".join(f"{column:>23}" for column in COLUMNS)
+    print(header)
+    for (board_size, depth), group in sorted(groups.items()):
+        for i, p in enumerate(PERCENTILES):
+            line = f"{board_size:>5} {depth:>5} {len(group):>6} {f'p{p}':>4}" if i == 0 else f"{'':>18} {f'p{p}':>4}"
+            for column in COLUMNS:
+                values = sorted(record[column] for record in group if record.get(column) is not None)
+                line += f"{percentile(values, p):>23.4g}" if values else f"{'-':>23}"
+            print(line)
+
+if __name__ == "__main__":
+    main()